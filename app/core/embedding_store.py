@@ -0,0 +1,147 @@
+# app/core/embedding_store.py
+import os
+import re
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VECTORS_FILE = "vectors.f32"
+MANIFEST_FILE = "manifest.json"
+# Manifest ditulis ulang setelah sekian file baru, dan selalu saat flush() di akhir pencarian
+MANIFEST_FLUSH_EVERY = 256
+
+
+class EmbeddingStore:
+    """Embedding chunk per file yang disimpan di disk, dikunci dengan (path, size, mtime).
+
+    Semua vektor (float32, sudah dinormalisasi) ditambahkan ke satu file vectors.f32 dan dibaca
+    lewat numpy memmap; manifest.json mencatat baris milik setiap file. Vektor file yang berubah
+    tidak langsung dihapus, baris lamanya dibuang saat store dipadatkan ketika dibuka lagi.
+    """
+
+    def __init__(self, store_dir, signature):
+        self.store_dir = store_dir
+        self.signature = signature
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._dirty = 0
+        os.makedirs(store_dir, exist_ok=True)
+        self._vectors_path = os.path.join(store_dir, VECTORS_FILE)
+        self._manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+        self._load()
+
+    def _load(self):
+        self.dim, self.rows, self.files = None, 0, {}
+        try:
+            with open(self._manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('signature') == self.signature:
+                self.dim, self.rows, self.files = manifest['dim'], manifest['rows'], manifest['files']
+        except (OSError, ValueError, KeyError):
+            pass
+        if self.dim is None:
+            self.rows, self.files = 0, {}
+        try:
+            # Baris yang tertulis setelah manifest terakhir (mis. aplikasi ditutup paksa) dibuang
+            with open(self._vectors_path, 'ab') as f:
+                f.truncate(self.rows * (self.dim or 0) * 4)
+        except OSError as e:
+            logger.warning(f"Cannot open embedding store {self.store_dir}: {e}")
+        live_rows = sum(count for _, _, _, count in self.files.values())
+        if self.rows and live_rows < self.rows // 2:
+            self._compact()
+
+    def _compact(self):
+        matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(self.rows, self.dim))
+        tmp_path = self._vectors_path + '.tmp'
+        files, row = {}, 0
+        with open(tmp_path, 'wb') as f:
+            for path, (size, mtime, start, count) in self.files.items():
+                f.write(np.ascontiguousarray(matrix[start:start + count]).tobytes())
+                files[path] = [size, mtime, row, count]
+                row += count
+        del matrix
+        os.replace(tmp_path, self._vectors_path)
+        self.files, self.rows = files, row
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {'signature': self.signature, 'dim': self.dim, 'rows': self.rows, 'files': self.files}
+        tmp_path = self._manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path)
+        self._dirty = 0
+
+    def lookup(self, entry):
+        """(baris awal, jumlah baris) jika embedding untuk versi file ini sudah ada, selain itu None."""
+        record = self.files.get(entry.path)
+        if record is None or record[0] != entry.size or record[1] != entry.modified:
+            return None
+        return record[2], record[3]
+
+    def add(self, entry, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                return
+            try:
+                with open(self._vectors_path, 'ab') as f:
+                    f.write(vectors.tobytes())
+            except OSError as e:
+                logger.debug(f"Cannot store embeddings for {entry.path}: {e}")
+                return
+            self.files[entry.path] = [entry.size, entry.modified, self.rows, len(vectors)]
+            self.rows += len(vectors)
+            self._dirty += 1
+            if self._dirty >= MANIFEST_FLUSH_EVERY:
+                self._write_manifest()
+
+    def max_scores(self, entries, query_vector):
+        """Skor cosine tertinggi per file (vektor sudah dinormalisasi, jadi cukup dot product).
+
+        Semua baris dari entries digabung menjadi satu perkalian matriks, lalu diambil maksimum
+        per file dengan np.maximum.reduceat.
+        """
+        ranges = [self.lookup(entry) for entry in entries]
+        with self._lock:
+            if self._matrix is None or len(self._matrix) < self.rows:
+                self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(self.rows, self.dim))
+            matrix = self._matrix
+        rows = np.concatenate([np.arange(start, start + count) for start, count in ranges])
+        scores = matrix[rows] @ np.asarray(query_vector, dtype=np.float32)
+        offsets = np.cumsum([0] + [count for _, count in ranges[:-1]])
+        return np.maximum.reduceat(scores, offsets)
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                try:
+                    self._write_manifest()
+                except OSError as e:
+                    logger.warning(f"Cannot write embedding manifest {self._manifest_path}: {e}")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_embedding_store(base_dir, model_name, chunking):
+    """Satu EmbeddingStore per model per proses; None jika numpy tidak tersedia."""
+    if np is None:
+        return None
+    store_dir = os.path.join(base_dir, re.sub(r'[^\w.-]+', '_', model_name))
+    signature = f"{model_name}|{chunking}"
+    with _stores_lock:
+        store = _stores.get(store_dir)
+        if store is None or store.signature != signature:
+            store = _stores[store_dir] = EmbeddingStore(store_dir, signature)
+        return store
@@ -0,0 +1,268 @@
+# app/core/index_watcher.py
+import os
+import sys
+import time
+import errno
+import struct
+import select
+import logging
+import threading
+import ctypes
+import ctypes.util
+
+from .search_engine import SearchEngine
+from .path_filters import PathFilter
+
+logger = logging.getLogger(__name__)
+
+try:
+    from whoosh.index import LockError
+except ImportError:
+    LockError = None
+
+# Konstanta dari <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct('iIII') # wd, mask, cookie, len
+
+
+class _Inotify:
+    """Pembungkus minimal inotify(7) lewat ctypes, hanya tersedia di Linux."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._libc = libc
+        self.fd = fd
+
+    def add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class IndexWatcher:
+    """Menjaga index Whoosh tetap sinkron dengan folder sumbernya di background.
+
+    Di Linux perubahan dipantau dengan inotify dan diterapkan per file. Di OS lain, atau jika
+    inotify tidak tersedia / batas watch habis, folder di-scan ulang secara berkala dan
+    dibandingkan dengan size & mtime di index (sama seperti build index inkremental).
+    Event dikumpulkan dulu dan baru diterapkan setelah batch_delay detik tanpa event baru, atau
+    paling lambat max_batch_age detik setelah event pertama (file yang terus ditulis, mis. log,
+    tidak menahan batch selamanya).
+    """
+
+    def __init__(self, engine_params=None, batch_delay=2.0, poll_interval=60.0, status_callback=None, max_batch_age=10.0):
+        self._stop_event = threading.Event()
+        self.engine = SearchEngine(dict(engine_params or {}), self._stop_event)
+        self.batch_delay = batch_delay
+        self.max_batch_age = max_batch_age
+        self.poll_interval = poll_interval
+        self.status_callback = status_callback or (lambda msg: None)
+        self._thread = None
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="IndexWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        sources = self.engine.read_index_sources()
+        for source in sources:
+            source['filter'] = PathFilter(set(source['ignore_folders']), source['ignore_files'])
+
+        inotify = None
+        if sys.platform.startswith('linux'):
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable, polling for index changes instead: {e}")
+
+        self._watches = {} # wd -> (folder, source)
+        self._polled = []
+        try:
+            for source in sources:
+                if not (inotify and self._watch_tree(inotify, source['path'], source) is not None):
+                    self._polled.append(source)
+
+            # Perubahan selama watcher belum jalan tidak akan muncul sebagai event, jadi sinkronkan dulu
+            for source in sources:
+                if self._stop_event.is_set(): return
+                self._rescan(source)
+
+            pending = {} # root -> (file yang berubah, folder yang hilang)
+            last_event = first_event = 0.0
+            next_poll = time.monotonic() + self.poll_interval
+            while not self._stop_event.is_set():
+                if inotify and self._watches:
+                    events = inotify.read_events(timeout=0.5)
+                    if events:
+                        had_pending = bool(pending)
+                        self._queue_events(inotify, events, pending)
+                        last_event = time.monotonic()
+                        if not had_pending:
+                            first_event = last_event
+                else:
+                    self._stop_event.wait(0.5)
+
+                now = time.monotonic()
+                if pending and (now - last_event >= self.batch_delay or now - first_event >= self.max_batch_age):
+                    self._flush(pending)
+                    # Batch yang gagal karena index terkunci dicoba lagi setelah jeda
+                    last_event = first_event = now
+                if self._polled and now >= next_poll:
+                    for source in list(self._polled):
+                        if self._stop_event.is_set(): break
+                        self._rescan(source)
+                    next_poll = time.monotonic() + self.poll_interval
+        except Exception as e:
+            logger.error(f"Index watcher stopped unexpectedly: {e}")
+        finally:
+            if inotify:
+                inotify.close()
+
+    def _watch_tree(self, inotify, top, source):
+        """Pasang watch di top dan semua subfolder yang tidak di-ignore; return file di dalamnya.
+
+        Return None jika batas watch (fs.inotify.max_user_watches) habis, dan source tersebut
+        dipindah ke mode polling.
+        """
+        path_filter, root = source['filter'], source['path']
+        files, stack = [], [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                # Watch dipasang sebelum isi folder dibaca agar file baru di sela keduanya tidak terlewat
+                wd = inotify.add_watch(directory)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    logger.warning(f"inotify watch limit reached, polling {root} instead")
+                    self._unwatch(inotify, root)
+                    if source not in self._polled:
+                        self._polled.append(source)
+                    return None
+                continue
+            self._watches[wd] = (directory, source)
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not path_filter.skip_dir(entry.name, entry.path, root) and not self.engine.is_app_data_path(entry.path):
+                                stack.append(entry.path)
+                        elif entry.is_file() and not path_filter.skip_file(entry.name, entry.path, root):
+                            files.append(entry.path)
+            except OSError:
+                continue
+        return files
+
+    def _unwatch(self, inotify, top):
+        prefix = os.path.join(top, '')
+        for wd, (directory, _source) in list(self._watches.items()):
+            if directory == top or directory.startswith(prefix):
+                inotify.rm_watch(wd)
+                del self._watches[wd]
+
+    def _queue_events(self, inotify, events, pending):
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                # Event hilang karena antrean kernel penuh: scan ulang semua folder yang di-watch
+                logger.info("inotify queue overflow, rescanning watched indexes")
+                for source in {id(s): s for _d, s in self._watches.values()}.values():
+                    self._rescan(source)
+                continue
+            watched = self._watches.get(wd)
+            if watched is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                continue
+            directory, source = watched
+            path = os.path.join(directory, name)
+            if self.engine.is_app_data_path(path):
+                continue # Tulisan index/cache aplikasi sendiri
+            changed, removed = pending.setdefault(source['path'], (set(), set()))
+            if not mask & IN_ISDIR:
+                changed.add(path)
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                if not source['filter'].skip_dir(name, path, source['path']):
+                    files = self._watch_tree(inotify, path, source)
+                    if files is not None:
+                        changed.update(files)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                removed.add(path)
+                self._unwatch(inotify, path)
+
+    def _flush(self, pending):
+        for root, (changed, removed) in list(pending.items()):
+            try:
+                stats = self.engine.update_index_paths(root, sorted(changed), sorted(removed))
+            except Exception as e:
+                if LockError and isinstance(e, LockError):
+                    continue # Index sedang ditulis (mis. Build Index), simpan batch untuk percobaan berikutnya
+                logger.error(f"Failed to update index for {root}: {e}")
+                stats = None
+            del pending[root]
+            if stats and (stats['added'] or stats['updated'] or stats['deleted']):
+                self.status_callback(f"Index updated for {root}: +{stats['added']} ~{stats['updated']} -{stats['deleted']}")
+
+    def _rescan(self, source):
+        try:
+            stats = self.engine.build_index_for_path(source['path'], set(source['ignore_folders']), source['ignore_files'], lambda msg: None)
+        except Exception as e:
+            if not (LockError and isinstance(e, LockError)):
+                logger.error(f"Failed to rescan index for {source['path']}: {e}")
+            return
+        if stats['added'] or stats['updated'] or stats['deleted']:
+            self.status_callback(f"Index updated for {source['path']}: +{stats['added']} ~{stats['updated']} -{stats['deleted']}")
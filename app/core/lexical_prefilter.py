@@ -0,0 +1,49 @@
+# app/core/lexical_prefilter.py
+import re
+import math
+import heapq
+from collections import Counter
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+class BM25Prefilter:
+    """Ranking BM25 sederhana untuk memilih file kandidat sebelum di-encode model semantic.
+
+    Hanya frekuensi kata-kata query dan panjang dokumen yang disimpan per file, jadi isi file
+    tidak perlu ditahan di memori. IDF dan rata-rata panjang dokumen dihitung di top(), setelah
+    semua file masuk.
+    """
+
+    def __init__(self, query, k1=1.5, b=0.75):
+        self.terms = sorted({term for term in _TOKEN_RE.findall(query.lower()) if len(term) > 1})
+        self._term_set = set(self.terms)
+        self.k1, self.b = k1, b
+        self._docs = [] # (entry, frekuensi tiap term, panjang dokumen)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, entry, text):
+        tokens = _TOKEN_RE.findall(text.lower())
+        counts = Counter(filter(self._term_set.__contains__, tokens))
+        self._docs.append((entry, tuple(counts[term] for term in self.terms), len(tokens)))
+
+    def top(self, n):
+        """n entry dengan skor BM25 tertinggi, urut dari skor terbesar."""
+        docs = self._docs
+        if len(docs) <= n:
+            return [entry for entry, _, _ in docs]
+        avgdl = (sum(length for _, _, length in docs) / len(docs)) or 1
+        idf = []
+        for i in range(len(self.terms)):
+            df = sum(1 for _, tf, _ in docs if tf[i])
+            idf.append(math.log(1 + (len(docs) - df + 0.5) / (df + 0.5)))
+        k1, b = self.k1, self.b
+
+        def score(doc):
+            _, tf, length = doc
+            norm = k1 * (1 - b + b * length / avgdl)
+            return sum(w * f * (k1 + 1) / (f + norm) for w, f in zip(idf, tf) if f)
+
+        return [entry for entry, _, _ in heapq.nlargest(n, docs, key=score)]
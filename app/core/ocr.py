@@ -0,0 +1,130 @@
+# app/core/ocr.py
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pytesseract
+    from PIL import Image, ImageOps
+    from PIL.ExifTags import TAGS
+except ImportError:
+    pytesseract = None
+    Image = None
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# Sisi terpanjang gambar sebelum OCR; foto kamera 4000+ px lambat di-OCR tanpa menambah akurasi
+OCR_MAX_SIDE = 3000
+BINARIZE_THRESHOLD = 160
+# Resolusi render halaman PDF hasil scan; 72 dpi (default PyMuPDF) terlalu kecil untuk tesseract
+PDF_OCR_DPI = 200
+PDF_OCR_MAX_PAGES = 100
+
+
+def prepare_image(img, max_side=OCR_MAX_SIDE, binarize=False):
+    """Grayscale + autocontrast, diperkecil ke max_side, dan opsional dijadikan hitam-putih."""
+    img = ImageOps.autocontrast(img.convert('L'))
+    if max_side and max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+    if binarize:
+        img = img.point([255 if value >= BINARIZE_THRESHOLD else 0 for value in range(256)])
+    return img
+
+
+def image_text(file_path, max_side=OCR_MAX_SIDE, binarize=False):
+    """Teks OCR sebuah file gambar, ditambah tag EXIF-nya."""
+    with Image.open(file_path) as img:
+        exif_data = img.getexif()
+        content = pytesseract.image_to_string(prepare_image(img, max_side, binarize))
+    for tag_id in exif_data or ():
+        tag = TAGS.get(tag_id, tag_id)
+        data = exif_data.get(tag_id)
+        if isinstance(data, bytes):
+            data = data.decode(errors='ignore')
+        content += f"\n{tag}: {data}"
+    return content
+
+
+def pdf_page_text(file_path, page_number, dpi=PDF_OCR_DPI, max_side=OCR_MAX_SIDE, binarize=False):
+    """Teks OCR satu halaman PDF yang dirender pada dpi tertentu."""
+    with fitz.open(file_path) as doc:
+        pix = doc[page_number].get_pixmap(dpi=dpi)
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    return pytesseract.image_to_string(prepare_image(img, max_side, binarize))
+
+
+def _init_ocr_process():
+    # Satu thread tesseract per proses; paralelisme datang dari jumlah proses di pool
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+
+class OcrPool:
+    """Process pool khusus OCR dengan jumlah job yang sedang berjalan dibatasi.
+
+    Setiap pemanggilan tesseract adalah proses sendiri, jadi jumlah worker mengikuti jumlah core,
+    terpisah dari thread pembaca file. submit() menunggu slot kosong agar antrean tidak tumbuh
+    tanpa batas saat folder berisi ribuan gambar. Proses worker dibuat sekali dan dipakai ulang
+    antar pencarian (lihat get_ocr_pool).
+    """
+
+    def __init__(self, workers=None, queue_size=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.queue_size = max(self.workers, queue_size or self.workers * 2)
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_ocr_process)
+
+    def submit(self, fn, *args, cancel_event=None):
+        """Jalankan fn(*args) di pool; None jika dibatalkan selagi menunggu slot."""
+        while not self._slots.acquire(timeout=0.1):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def submit_image(self, file_path, max_side=OCR_MAX_SIDE, binarize=False, cancel_event=None):
+        return self.submit(image_text, file_path, max_side, binarize, cancel_event=cancel_event)
+
+    def submit_pdf_page(self, file_path, page_number, dpi=PDF_OCR_DPI, max_side=OCR_MAX_SIDE, binarize=False, cancel_event=None):
+        return self.submit(pdf_page_text, file_path, page_number, dpi, max_side, binarize, cancel_event=cancel_event)
+
+    def shutdown(self, cancel=False):
+        self._executor.shutdown(wait=not cancel, cancel_futures=cancel)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_ocr_pool(workers=None, queue_size=None):
+    """OcrPool bersama untuk seluruh proses; dibuat ulang hanya jika jumlah worker/antrean berubah.
+
+    Memulai proses baru mahal (terutama dengan spawn di Windows), jadi pool tidak dibuat per pencarian.
+    """
+    global _pool
+    with _pool_lock:
+        wanted_workers = max(1, workers or os.cpu_count() or 1)
+        wanted_queue = max(wanted_workers, queue_size or wanted_workers * 2)
+        if _pool is None or (_pool.workers, _pool.queue_size) != (wanted_workers, wanted_queue):
+            if _pool is not None:
+                _pool.shutdown(cancel=True)
+            _pool = OcrPool(wanted_workers, wanted_queue)
+        return _pool
+
+
+def shutdown_ocr_pool():
+    """Hentikan pool bersama (dipanggil saat aplikasi ditutup)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel=True)
+            _pool = None
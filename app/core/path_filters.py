@@ -0,0 +1,115 @@
+# app/core/path_filters.py
+import os
+import re
+import fnmatch
+
+# Di Windows nama file tidak case-sensitive (mengikuti os.path.normcase seperti fnmatch)
+_CASE_FLAGS = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+_GLOB_CHARS = set('*?[')
+
+
+def _is_absolute(pattern):
+    return os.path.isabs(pattern) or re.match(r'^[A-Za-z]:/', pattern) is not None
+
+
+def _path_glob_to_regex(pattern):
+    """Glob path gaya .gitignore -> regex: `*` dan `?` tidak melewati '/', `**` bisa melewati folder."""
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?'); i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*'); i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*'); i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]'); i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                out.append(re.escape('[')); i += 1
+                continue
+            body = pattern[i + 1:end].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append(f'[{body}]'); i = end + 1
+        else:
+            out.append(re.escape(pattern[i])); i += 1
+    return ''.join(out)
+
+
+def _combine(regexes):
+    if not regexes: return None
+    return re.compile('|'.join(f'(?:{r})' for r in regexes), _CASE_FLAGS)
+
+
+class PathFilter:
+    """Aturan ignore yang dikompilasi sekali per pencarian.
+
+    - Nama folder biasa dicocokkan lewat set, glob `*.ext` lewat set ekstensi.
+    - Glob nama lainnya digabung menjadi satu regex.
+    - Pola yang mengandung '/' adalah glob path gaya .gitignore relatif terhadap folder pencarian
+      (atau path absolut), mendukung `**`. Akhiran '/' berarti hanya untuk folder.
+    """
+
+    def __init__(self, ignore_folders, ignore_files):
+        self.dir_names = set()
+        dir_name_globs, dir_path_globs, dir_abs_globs = [], [], []
+        self.file_exts = set()
+        file_name_globs, file_path_globs, file_abs_globs = [], [], []
+
+        entries = [(p, True) for p in ignore_folders] + [(p, False) for p in ignore_files]
+        for raw, is_dir_rule in entries:
+            pattern = raw.strip().replace('\\', '/')
+            if not pattern: continue
+            if pattern.endswith('/'):
+                is_dir_rule = True
+                pattern = pattern.rstrip('/')
+                if not pattern: continue
+
+            if '/' in pattern:
+                regex = _path_glob_to_regex(pattern) + r'\Z'
+                if _is_absolute(pattern):
+                    (dir_abs_globs if is_dir_rule else file_abs_globs).append(regex)
+                # '/build' bisa berarti path absolut atau (gaya .gitignore) relatif dari folder pencarian
+                if not re.match(r'^[A-Za-z]:/', pattern):
+                    regex = _path_glob_to_regex(pattern.lstrip('/')) + r'\Z'
+                    (dir_path_globs if is_dir_rule else file_path_globs).append(regex)
+            elif is_dir_rule:
+                if _GLOB_CHARS & set(pattern):
+                    dir_name_globs.append(fnmatch.translate(os.path.normcase(pattern)))
+                else:
+                    self.dir_names.add(pattern)
+            else:
+                suffix = pattern[1:]
+                if pattern.startswith('*.') and not (_GLOB_CHARS | {'.'}) & set(suffix[1:]):
+                    self.file_exts.add(os.path.normcase(suffix))
+                else:
+                    file_name_globs.append(fnmatch.translate(os.path.normcase(pattern)))
+
+        self.dir_name_re = _combine(dir_name_globs)
+        self.dir_path_re = _combine(dir_path_globs)
+        self.dir_abs_re = _combine(dir_abs_globs)
+        self.file_name_re = _combine(file_name_globs)
+        self.file_path_re = _combine(file_path_globs)
+        self.file_abs_re = _combine(file_abs_globs)
+
+    @staticmethod
+    def _relative(path, root):
+        return path[len(root):].replace('\\', '/').lstrip('/')
+
+    def skip_dir(self, name, path, root):
+        if name in self.dir_names: return True
+        if self.dir_name_re and self.dir_name_re.match(os.path.normcase(name)): return True
+        if self.dir_path_re and self.dir_path_re.match(self._relative(path, root)): return True
+        if self.dir_abs_re and self.dir_abs_re.match(path.replace('\\', '/')): return True
+        return False
+
+    def skip_file(self, name, path, root):
+        if self.file_exts:
+            dot = name.rfind('.')
+            if dot != -1 and os.path.normcase(name[dot:]) in self.file_exts: return True
+        if self.file_name_re and self.file_name_re.match(os.path.normcase(name)): return True
+        if self.file_path_re and self.file_path_re.match(self._relative(path, root)): return True
+        if self.file_abs_re and self.file_abs_re.match(path.replace('\\', '/')): return True
+        return False
@@ -1,11 +1,20 @@
 import os
-import fnmatch
+import json
+import math
+import stat
+import mmap
+import codecs
+import io
+import zlib
+import zipfile
+import tarfile
 import string
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
 import re
 import queue
 import textwrap
+import time
+from collections import namedtuple, deque
 import logging
 import threading
 
@@ -14,33 +23,23 @@ logger = logging.getLogger(__name__)
 try:
     import fitz
     import docx
-    import zipfile
 except ImportError:
     fitz = None
     docx = None
-    zipfile = None
 
 try:
     import pytesseract
-    from PIL import Image
-    from PIL.ExifTags import TAGS
 except ImportError:
     pytesseract = None
-    Image = None
 
 try:
-    from whoosh.index import create_in, open_dir
-    from whoosh.fields import Schema, TEXT, ID, NUMERIC
+    from whoosh.index import create_in, open_dir, exists_in
+    from whoosh.fields import Schema, TEXT, ID, NUMERIC, KEYWORD
     from whoosh.qparser import QueryParser
+    from whoosh.query import Prefix, NumericRange, And
 except ImportError:
     create_in = None
 
-try:
-    from sentence_transformers import SentenceTransformer, util
-    semantic_model = None  # Lazy load
-except ImportError:
-    SentenceTransformer = None
-
 try:
     import mutagen
 except ImportError:
@@ -61,11 +60,72 @@ except ImportError:
 import email
 from email.policy import default
 
+from .matchers import build_matcher, CASEFOLD_WINDOW
+from .text_cache import get_text_cache
+from .path_filters import PathFilter
+from .trigrams import text_trigrams, regex_trigram_query, GRAM_FIELD
+from .embedding_store import get_embedding_store
+from .lexical_prefilter import BM25Prefilter
+from .semantic_models import load_semantic_model, model_id, DEFAULT_MODEL, SEMANTIC_AVAILABLE
+from .ocr import get_ocr_pool, image_text, pdf_page_text, OCR_MAX_SIDE, PDF_OCR_DPI, PDF_OCR_MAX_PAGES
+
+# Ekstraksi mahal yang hasilnya disimpan di text cache (teks biasa & arsip tidak di-cache)
+CACHED_EXTRACTIONS = {".pdf", ".docx", ".epub", ".msg", ".png", ".jpg", ".jpeg"}
+# Gambar yang di-OCR jika opsi OCR aktif
+OCR_IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+# Arsip yang isinya ikut dicari jika opsi Archive aktif
+ARCHIVE_EXTENSIONS = {".zip", ".tar"}
+# Member arsip yang lebih besar dari ini (setelah dekompresi) dilewati
+ARCHIVE_MEMBER_MAX_MB = 100
+
+# Ekstensi tanpa extractor yang pasti bukan teks; dilewati tanpa membuka file
+BINARY_EXTENSIONS = {
+    ".exe", ".dll", ".sys", ".so", ".dylib", ".o", ".obj", ".lib", ".a", ".pyc", ".pyd", ".class", ".jar",
+    ".msi", ".cab", ".iso", ".img", ".vhd", ".vhdx", ".vmdk", ".dmg", ".bin",
+    ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz", ".zst", ".tgz", ".tar",
+    ".mp3", ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm", ".wav", ".flac", ".ogg", ".m4a", ".aac",
+    ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".ico", ".tif", ".tiff", ".webp", ".psd",
+    ".ttf", ".otf", ".woff", ".woff2", ".db", ".sqlite", ".mdb", ".pdb", ".pak",
+}
+# Byte yang wajar muncul di file teks (printable, UTF-8 multibyte, dan kontrol umum seperti \t \n \r)
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+SNIFF_BYTES = 8192
+
+# File hasil walker beserta stat dari DirEntry, dibawa sepanjang pipeline agar tidak perlu os.stat ulang
+FileEntry = namedtuple('FileEntry', ['path', 'size', 'modified'])
+
+class _PartialText(str):
+    """Teks OCR PDF yang berhenti lebih awal karena sudah match; tidak boleh masuk text cache."""
+
+# Sentinel yang dikirim walker ke antrean path saat semua folder selesai di-walk
+_WALK_DONE = object()
+
+# Pemotongan teks untuk pencarian semantic; bersama model_id ikut menentukan isi embedding store
+SEMANTIC_CHAR_LIMIT = 10000 # Limit to first 10,000 characters to prevent OOM
+SEMANTIC_CHUNK_WIDTH = 500
+SEMANTIC_THRESHOLD = 0.65 # Threshold dinaikkan untuk akurasi > 90%
+# Jumlah file dengan embedding tersimpan yang dinilai sekaligus dalam satu perkalian matriks
+EMBEDDED_SCORE_BATCH = 2048
+
+# Metadata sumber index (folder & pola ignore), dibaca IndexWatcher untuk tahu folder yang dipantau
+INDEX_SOURCE_FILE = "source.json"
+# Build Index menunggu lock writer selama ini (mis. IndexWatcher sedang rescan folder yang sama) sebelum LockError
+INDEX_LOCK_TIMEOUT = 60.0
+
 class SearchEngine:
     def __init__(self, search_params, cancel_event):
         self.params = search_params
         self.cancel_event = cancel_event
         self.index_dir_base = os.path.join(os.path.expanduser("~"), ".file_search_pro_index")
+        self.semantic_model = None
+        self._embedding_store = None
+        self._prefilter = None
+        self._ocr_pool = None
+        self._ocr_queue = None
+        self._text_cache_failed = False
+        self.binary_skipped = 0
+        self._skip_lock = threading.Lock()
 
     def _get_index_dir_for_path(self, search_path):
         import hashlib
@@ -73,21 +133,73 @@ class SearchEngine:
         path_hash = hashlib.md5(normalized_path.encode('utf-8')).hexdigest()
         return os.path.join(self.index_dir_base, path_hash)
 
-    def build_index_for_path(self, search_path, ignore_folders, ignore_files, progress_callback):
+    def _index_schema(self):
+        # indexed = waktu (epoch) saat dokumen ditulis ke index, untuk cek kesegaran di mode hybrid
+        # size 64-bit (file > 2 GB) dan waktu sebagai float agar NumericRange tanggal presisi sampai sub-detik.
+        # grams = trigram isi file, untuk mencari kandidat file pada pencarian regex
+        return Schema(path=ID(stored=True, unique=True), name=TEXT(stored=True), content=TEXT,
+                      size=NUMERIC(int, bits=64, stored=True), modified=NUMERIC(float, bits=64, stored=True),
+                      indexed=NUMERIC(float, bits=64, stored=True), grams=KEYWORD(scorable=False))
+
+    @staticmethod
+    def _schema_signature(schema):
+        # Schema.__eq__ Whoosh tidak membedakan tipe/bits NUMERIC, jadi dibandingkan sendiri
+        return sorted((name, type(field).__name__, getattr(field, 'numtype', None), getattr(field, 'bits', None))
+                      for name, field in schema.items())
+
+    @staticmethod
+    def _index_state(fields):
+        return (fields.get('size'), fields.get('modified'), fields.get('indexed'))
+
+    @staticmethod
+    def _is_fresh(entry, state):
+        """True jika versi file di index masih sama dengan file di disk (size & mtime sama).
+
+        File yang mtime-nya tidak lebih tua dari waktu index dianggap basi, karena bisa saja
+        berubah lagi saat sedang diekstrak.
+        """
+        if state is None or state[:2] != (entry.size, entry.modified):
+            return False
+        return state[2] is None or entry.modified < state[2]
+
+    def _open_index_for_update(self, index_dir, schema, incremental):
+        # Buka index lama untuk update inkremental; buat ulang jika belum ada atau skema berbeda
+        if incremental and exists_in(index_dir):
+            try:
+                ix = open_dir(index_dir)
+                if self._schema_signature(ix.schema) == self._schema_signature(schema):
+                    with ix.searcher() as searcher:
+                        indexed = {fields['path']: self._index_state(fields) for fields in searcher.all_stored_fields()}
+                    return ix, indexed
+                logger.info(f"Index schema changed for {index_dir}, rebuilding from scratch")
+            except Exception as e:
+                logger.warning(f"Cannot open existing index {index_dir}, rebuilding: {e}")
+        return create_in(index_dir, schema), {}
+
+    def build_index_for_path(self, search_path, ignore_folders, ignore_files, progress_callback, incremental=True):
+        """Membangun atau memperbarui index Whoosh untuk satu folder.
+
+        Dengan incremental=True, hanya file baru/berubah (dibandingkan dari size & modified)
+        yang diekstrak ulang, dan entry untuk file yang sudah dihapus ikut dibuang.
+        Mengembalikan dict berisi jumlah file added/updated/deleted/skipped.
+        """
         if not create_in:
             raise Exception("Whoosh is not installed. Please pip install Whoosh")
         
+        # Path di index selalu absolut agar bisa dicocokkan saat mencari di subfolder (lihat _find_index_for_path)
+        search_path = os.path.abspath(search_path)
         index_dir = self._get_index_dir_for_path(search_path)
         if not os.path.exists(index_dir):
             os.makedirs(index_dir)
             
-        schema = Schema(path=ID(stored=True, unique=True), name=TEXT(stored=True), content=TEXT, size=NUMERIC(stored=True), modified=NUMERIC(stored=True))
-        ix = create_in(index_dir, schema)
-        writer = ix.writer()
+        ix, indexed = self._open_index_for_update(index_dir, self._index_schema(), incremental)
+        stats = {'added': 0, 'updated': 0, 'deleted': 0, 'skipped': 0}
         
         # Temporary overwrite self.params for _collect_files to work
+        # (opsi performa seperti walker_workers/text_cache_mb dari pemanggil tetap dipakai)
         old_params = getattr(self, 'params', None)
         self.params = {
+            **(old_params or {}),
             'search_paths': [search_path],
             'ignore_folders': ignore_folders,
             'ignore_files': ignore_files,
@@ -100,83 +212,433 @@ class SearchEngine:
         if old_cancel is None:
             self.cancel_event = type('obj', (object,), {'is_set': lambda: False})
             
+        writer = ix.writer(timeout=INDEX_LOCK_TIMEOUT, delay=0.5, **self._index_writer_options())
         try:
+            indexed_at = time.time()
             all_files = self._collect_files(progress_callback)
+            if self.cancel_event.is_set():
+                # Daftar file tidak lengkap, jangan sampai entry yang masih ada ikut terhapus
+                writer.cancel()
+                return stats
             total = len(all_files)
+            seen = set()
+            pending = []
+            for entry in all_files:
+                seen.add(entry.path)
+                previous = indexed.get(entry.path)
+                if self._is_fresh(entry, previous):
+                    stats['skipped'] += 1
+                else:
+                    pending.append((entry, previous))
             
-            for i, file_path in enumerate(all_files):
-                progress_callback(f"Indexing... {i+1}/{total}")
+            # Ekstraksi jalan paralel di worker pool, writer Whoosh tetap hanya dipakai di thread ini
+            done = stats['skipped']
+            for entry, previous, content, error in self._extract_for_index(pending):
+                done += 1
+                progress_callback(f"Indexing... {done}/{total}{self._binary_skip_note()}")
+                file_path = entry.path
+                if error:
+                    logger.debug(f"Error indexing {file_path}: {error}")
+                    continue
                 try:
-                    content = self._get_file_content(file_path)
-                    if content:
-                        stat = os.stat(file_path)
-                        writer.add_document(path=file_path, name=os.path.basename(file_path), content=content, size=stat.st_size, modified=stat.st_mtime)
+                    self._write_index_document(writer, entry, previous, content, stats, indexed_at)
                 except Exception as e:
                     logger.debug(f"Error indexing {file_path}: {e}")
                     continue
+            
+            if self.cancel_event.is_set():
+                writer.cancel()
+                return stats
+            
+            for removed_path in indexed.keys() - seen:
+                writer.delete_by_term('path', removed_path)
+                stats['deleted'] += 1
                     
-            progress_callback("Committing index...")
+            progress_callback(f"Committing index... (added {stats['added']}, updated {stats['updated']}, deleted {stats['deleted']}, skipped {stats['skipped']})")
             writer.commit()
+            self._write_index_source(index_dir, search_path, ignore_folders, ignore_files)
+            return stats
             
+        except BaseException:
+            writer.cancel()
+            raise
         finally:
             # Restore state
             if old_params: self.params = old_params
             if old_cancel: self.cancel_event = old_cancel
 
+    def _write_index_document(self, writer, entry, previous, content, stats, indexed_at):
+        file_path = entry.path
+        if content:
+            doc = dict(path=file_path, name=os.path.basename(file_path), content=content, size=entry.size, modified=entry.modified,
+                       indexed=indexed_at, grams=text_trigrams(content))
+            if previous:
+                writer.update_document(**doc)
+                stats['updated'] += 1
+            else:
+                writer.add_document(**doc)
+                stats['added'] += 1
+        elif previous:
+            # Isi file sekarang kosong/tidak terbaca, entry lama sudah tidak valid
+            writer.delete_by_term('path', file_path)
+            stats['deleted'] += 1
+
+    def _write_index_source(self, index_dir, search_path, ignore_folders, ignore_files):
+        source = {
+            'path': os.path.abspath(search_path),
+            'ignore_folders': sorted(ignore_folders or []),
+            'ignore_files': list(ignore_files or []),
+        }
+        source_file = os.path.join(index_dir, INDEX_SOURCE_FILE)
+        try:
+            with open(source_file + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(source, f)
+            os.replace(source_file + '.tmp', source_file)
+        except OSError as e:
+            logger.warning(f"Could not write index source for {search_path}: {e}")
+
+    def _read_index_source(self, index_dir):
+        try:
+            with open(os.path.join(index_dir, INDEX_SOURCE_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def read_index_sources(self):
+        """Daftar source (path & pola ignore) dari semua index yang dibangun dengan versi ini."""
+        sources = []
+        try:
+            names = os.listdir(self.index_dir_base)
+        except OSError:
+            return sources
+        for name in names:
+            source = self._read_index_source(os.path.join(self.index_dir_base, name))
+            if source and os.path.isdir(source.get('path', '')):
+                sources.append(source)
+        return sources
+
+    def update_index_paths(self, search_path, changed_paths, removed_dirs=()):
+        """Terapkan perubahan sejumlah file ke index yang sudah ada, tanpa walk ulang seluruh folder.
+
+        changed_paths berisi file yang dibuat/diubah/dihapus (dicek ulang dengan stat), removed_dirs
+        berisi folder yang dihapus/dipindah sehingga semua entry di bawahnya dibuang.
+        Mengembalikan dict added/updated/deleted/skipped, atau None jika index tidak ada.
+        """
+        index_dir = self._get_index_dir_for_path(search_path)
+        if not create_in or not exists_in(index_dir):
+            return None
+        source = self._read_index_source(index_dir) or {}
+        path_filter = PathFilter(set(source.get('ignore_folders', [])), source.get('ignore_files', []))
+        root = source.get('path', search_path)
+        stats = {'added': 0, 'updated': 0, 'deleted': 0, 'skipped': 0}
+        
+        ix = open_dir(index_dir)
+        writer = ix.writer(limitmb=self._index_writer_options()['limitmb'])
+        indexed_at = time.time()
+        # Hanya folder teratas yang dihapus per query, agar folder bersarang tidak dihitung dua kali
+        removed_prefixes = ()
+        for prefix in sorted(os.path.join(directory, '') for directory in removed_dirs):
+            if not prefix.startswith(removed_prefixes):
+                removed_prefixes += (prefix,)
+        try:
+            for prefix in removed_prefixes:
+                stats['deleted'] += writer.delete_by_query(Prefix('path', prefix))
+            with ix.searcher() as searcher:
+                for file_path in changed_paths:
+                    if self.is_app_data_path(file_path):
+                        continue
+                    # Entry di bawah folder yang dihapus sudah dibuang di atas; yang masih ada berarti dibuat ulang
+                    stored = None if file_path.startswith(removed_prefixes) else searcher.document(path=file_path)
+                    previous = self._index_state(stored) if stored else None
+                    try:
+                        stat_info = os.stat(file_path)
+                    except OSError:
+                        stat_info = None
+                    if (stat_info is None or not stat.S_ISREG(stat_info.st_mode)
+                            or path_filter.skip_file(os.path.basename(file_path), file_path, root)):
+                        if previous:
+                            writer.delete_by_term('path', file_path)
+                            stats['deleted'] += 1
+                        continue
+                    entry = FileEntry(file_path, stat_info.st_size, stat_info.st_mtime)
+                    if self._is_fresh(entry, previous):
+                        stats['skipped'] += 1
+                        continue
+                    try:
+                        content = self._get_file_content(file_path, entry)
+                        self._write_index_document(writer, entry, previous, content, stats, indexed_at)
+                    except Exception as e:
+                        logger.debug(f"Error indexing {file_path}: {e}")
+            if stats['added'] or stats['updated'] or stats['deleted']:
+                writer.commit()
+            else:
+                writer.cancel() # Tidak ada perubahan: jangan tulis TOC/segmen baru
+            return stats
+        except BaseException:
+            writer.cancel()
+            raise
+
+    def _index_writer_options(self):
+        """Opsi ix.writer(): limitmb per writer, dan procs>1 memakai MpWriter Whoosh.
+
+        multisegment=True menyimpan segmen tiap sub-writer apa adanya (commit lebih cepat,
+        search sedikit lebih lambat sampai index di-optimize).
+        """
+        procs = max(1, int(self.params.get('index_procs', 1) or 1))
+        options = {'limitmb': max(16, int(self.params.get('index_limitmb', 128) or 128))}
+        if procs > 1:
+            options['procs'] = procs
+            options['multisegment'] = bool(self.params.get('index_multisegment', False))
+        return options
+
+    def _extract_index_chunk(self, entries):
+        """Ekstrak isi beberapa file; error disimpan per file supaya satu file rusak tidak menggagalkan chunk."""
+        outcome = []
+        for entry in entries:
+            try:
+                outcome.append((self._get_file_content(entry.path, entry), None))
+            except Exception as e:
+                outcome.append((None, str(e)))
+        return outcome
+
+    def _extract_for_index(self, pending):
+        """Yield (entry, previous, content, error) untuk setiap (entry, previous) di pending, urut selesai."""
+        max_workers = max(1, self.params.get('max_workers', 4))
+        use_processes = self.params.get('backend') == 'process'
+        if use_processes:
+            chunk_size = self.params.get('process_chunk_size', 32)
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_scan_process, initargs=(self.params,))
+            submit_chunk = lambda entries: executor.submit(_extract_chunk, entries)
+        else:
+            chunk_size = 1
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            submit_chunk = lambda entries: executor.submit(self._extract_index_chunk, entries)
+        
+        chunks = (pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size))
+        futures = {}
+        try:
+            while True:
+                # Batasi chunk in-flight agar isi file yang sudah diekstrak tidak menumpuk di memori
+                while len(futures) < max_workers * 2 and not self.cancel_event.is_set():
+                    chunk = next(chunks, None)
+                    if chunk is None: break
+                    futures[submit_chunk([entry for entry, _ in chunk])] = chunk
+                if not futures:
+                    return
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = futures.pop(future)
+                    outcome = future.result()
+                    if use_processes:
+                        outcome, skipped = outcome
+                        with self._skip_lock:
+                            self.binary_skipped += skipped
+                    for (entry, previous), (content, error) in zip(chunk, outcome):
+                        yield entry, previous, content, error
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _path_key(path):
+        # Path dari index dan dari walker bisa beda separator/case (mis. "C:/x" dari dialog vs "C:\\x")
+        return os.path.normcase(os.path.normpath(path))
+
+    def is_app_data_path(self, path):
+        """True untuk folder data aplikasi sendiri (index, text cache, embedding) dan isinya.
+
+        Folder ini tidak pernah di-scan atau di-watch: menulis index akan memicu update index lagi.
+        """
+        base = self._path_key(os.path.abspath(self.index_dir_base))
+        key = self._path_key(os.path.abspath(path))
+        return key == base or key.startswith(os.path.join(base, ''))
+
+    def _find_index_for_path(self, search_path):
+        """Cari index untuk search_path: index folder itu sendiri, atau index folder induk terdekat.
+
+        Mengembalikan (index_dir, prefix); prefix None berarti seluruh index dipakai, selain itu
+        hanya dokumen yang path-nya diawali prefix. None jika tidak ada index yang mencakup path.
+        """
+        path = os.path.abspath(search_path)
+        current = path
+        while True:
+            index_dir = self._get_index_dir_for_path(current)
+            if exists_in(index_dir):
+                if current == path:
+                    return index_dir, None
+                # Hanya index dengan source.json yang path-nya pasti absolut dan bisa difilter per prefix
+                source = self._read_index_source(index_dir)
+                if source and not self._excluded_by_source(source, os.path.relpath(path, current)):
+                    return index_dir, os.path.join(source['path'], os.path.relpath(path, current), '')
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+    @staticmethod
+    def _excluded_by_source(source, relative_path):
+        """True jika salah satu folder di relative_path (relatif ke folder index) di-ignore saat index dibuat.
+
+        Folder seperti itu tidak pernah masuk index, jadi index induknya tidak bisa menjawab pencarian di sana.
+        """
+        path_filter = PathFilter(set(source.get('ignore_folders', [])), source.get('ignore_files', []))
+        root = source['path']
+        current = root
+        for name in relative_path.split(os.sep):
+            current = os.path.join(current, name)
+            if path_filter.skip_dir(name, current, root):
+                return True
+        return False
+
+    def _index_query(self, ix, prefix):
+        """Query Whoosh untuk keyword, plus filter size & tanggal sebagai NumericRange.
+
+        Mengembalikan (query, path_filter, filters_in_query). Index dengan schema lama (NUMERIC
+        32-bit) tidak bisa difilter dengan aman, jadi filter tetap dicek per hit oleh pemanggil.
+        """
+        if self.params.get('regex'):
+            # Hanya kandidat (file yang punya semua trigram literal regex), diverifikasi dengan regex asli
+            query = regex_trigram_query(self.params['keyword'], self._regex_flags())
+        else:
+            query = QueryParser("content", ix.schema).parse(self.params['keyword'])
+        filters_in_query = self._schema_signature(ix.schema) == self._schema_signature(self._index_schema())
+        if filters_in_query:
+            ranges = self._index_range_terms()
+            if ranges:
+                query = And([query] + ranges)
+        return query, (Prefix('path', prefix) if prefix else None), filters_in_query
+
+    def _index_range_terms(self):
+        terms = []
+        size_filters = self.params.get('size_filters')
+        if size_filters:
+            op, val = size_filters['op'], size_filters['val']
+            # Size di index berupa int, batas eksklusif diubah jadi batas inklusif
+            if op == 'greater than': terms.append(NumericRange('size', math.floor(val) + 1, None))
+            elif op == 'less than': terms.append(NumericRange('size', None, math.ceil(val) - 1))
+        after_ts, before_ts = self._date_bounds(self.params.get('date_filters'))
+        if after_ts is not None or before_ts is not None:
+            terms.append(NumericRange('modified', after_ts, before_ts, startexcl=True, endexcl=True))
+        return terms
+
+    def _search_indexes(self, indexed_paths, progress_callback, result_callback):
+        """Mode index saja: kirim hasil dari semua index (tanpa duplikat antar index yang tumpang tindih)."""
+        emitted = set()
+        for search_path, (index_dir, prefix) in indexed_paths.items():
+            progress_callback(f"Searching index for {search_path}...")
+            ix = open_dir(index_dir)
+            with ix.searcher() as searcher:
+                query, path_filter, filters_in_query = self._index_query(ix, prefix)
+                for hit in searcher.search(query, filter=path_filter, limit=None):
+                    if self.cancel_event.is_set(): return
+                    key = self._path_key(hit['path'])
+                    if key in emitted: continue
+                    emitted.add(key)
+                    if not filters_in_query:
+                        if not self._check_size(hit['size'], self.params.get('size_filters')): continue
+                        if not self._check_date(hit['modified'], self.params.get('date_filters')): continue
+                    
+                    result_callback({"name": hit['name'], "path": hit['path'], "size": hit['size'], "modified": hit['modified']})
+
+    def _regex_flags(self):
+        return 0 if self.params.get('case_sensitive') else re.IGNORECASE
+
+    def _query_index_snapshot(self, indexes):
+        """Untuk mode hybrid: state (size, modified, indexed) dokumen di index dan path yang cocok dengan keyword.
+
+        Hasil dari beberapa index digabung, dengan key path yang sudah dinormalisasi (_path_key).
+        Mengembalikan (states, hits, verify); verify True berarti hits hanya kandidat (mode regex).
+        """
+        verify = bool(self.params.get('regex'))
+        states, hits = {}, set()
+        for index_dir, prefix in indexes:
+            ix = open_dir(index_dir)
+            if verify and GRAM_FIELD not in ix.schema:
+                continue # Index lama tanpa trigram, file-filenya di-scan live
+            with ix.searcher() as searcher:
+                query, path_filter, _ = self._index_query(ix, prefix)
+                hit_docnums = set(searcher.search(query, filter=path_filter, limit=None).docs())
+                if prefix:
+                    # Index folder induk: hanya term path di bawah prefix yang dibaca, bukan stored fields seluruh index.
+                    # path unik per dokumen; term yang dokumennya sudah dihapus (belum di-merge) memberi None
+                    docnums = (searcher.document_number(path=path) for path in searcher.reader().expand_prefix('path', prefix))
+                    docs = ((docnum, searcher.stored_fields(docnum)) for docnum in docnums if docnum is not None)
+                else:
+                    docs = searcher.reader().iter_docs()
+                for docnum, fields in docs:
+                    key = self._path_key(fields['path'])
+                    states[key] = self._index_state(fields)
+                    if docnum in hit_docnums:
+                        hits.add(key)
+        return states, hits, verify
+
+    def _index_usable_for_query(self):
+        if not self.params.get('regex'):
+            return True
+        try:
+            return regex_trigram_query(self.params['keyword'], self._regex_flags()) is not None
+        except re.error:
+            return False # Regex tidak valid dilaporkan saat membuat matcher
+
     def run_search(self, progress_callback, result_callback, finish_callback):
-        # 1. Cek apakah ada index untuk path yang dicari
-        indexed_results_returned = False
-        if len(self.params.get('search_paths', [])) == 1:
-            search_path = self.params['search_paths'][0]
-            index_dir = self._get_index_dir_for_path(search_path)
-            
-            # Jika indexing tersedia, tidak menggunakan regex, ocr, semantic (karena Whoosh berbasis teks murni)
-            if os.path.exists(index_dir) and create_in and not self.params.get('regex') and not self.params.get('ocr') and not self.params.get('semantic'):
+        # 1. Cek index untuk setiap path yang dicari (index folder itu sendiri atau folder induknya)
+        index_snapshot = None
+        # Jika indexing tersedia, tidak menggunakan ocr, semantic (karena Whoosh berbasis teks murni)
+        if create_in and not self.params.get('ocr') and not self.params.get('semantic') and self._index_usable_for_query():
+            indexed_paths = {}
+            for search_path in self.params.get('search_paths', []):
+                found = self._find_index_for_path(search_path)
+                if found:
+                    indexed_paths[search_path] = found
+            if indexed_paths:
                 try:
-                    ix = open_dir(index_dir)
-                    with ix.searcher() as searcher:
-                        query_parser = QueryParser("content", ix.schema)
-                        query = query_parser.parse(self.params['keyword'])
-                        progress_callback(f"Searching index for {search_path}...")
-                        results = searcher.search(query, limit=None)
-                        for hit in results:
-                            if self.cancel_event.is_set(): break
-                            if not self._check_size(hit['size'], self.params.get('size_filters')): continue
-                            if not self._check_date(hit['modified'], self.params.get('date_filters')): continue
-                            
-                            result_callback({"name": hit['name'], "path": hit['path'], "size": hit['size'], "modified": hit['modified']})
-                    
-                    if not self.cancel_event.is_set():
-                        finish_callback()
-                        return
+                    if self.params.get('hybrid_index') or self.params.get('regex'):
+                        # Hybrid: file yang tidak berubah sejak di-index dijawab dari index, sisanya di-scan live.
+                        # Regex selalu lewat jalur ini karena kandidat dari trigram harus dibaca untuk verifikasi.
+                        progress_callback(f"Searching index for {', '.join(indexed_paths)}...")
+                        index_snapshot = self._query_index_snapshot(indexed_paths.values())
+                    else:
+                        self._search_indexes(indexed_paths, progress_callback, result_callback)
+                        # Path yang tidak punya index tetap di-scan live
+                        remaining = [p for p in self.params['search_paths'] if p not in indexed_paths]
+                        if not remaining and not self.cancel_event.is_set():
+                            finish_callback()
+                            return
+                        self.params = {**self.params, 'search_paths': remaining}
                 except Exception as e:
                     print(f"Index search failed, falling back to live search: {e}")
 
-        all_files = self._collect_files(progress_callback)
-        if self.cancel_event.is_set():
+        # Matcher dibuat sekali per pencarian (sekaligus validasi regex)
+        try:
+            self.matcher = build_matcher(self.params)
+        except re.error as e:
+            # Kembalikan file palsu/dummy sebagai notifikasi error atau panggil finish_callback
+            logger.error(f"Invalid regex: {e}")
             finish_callback()
             return
             
-        # Regex Validation
-        if self.params.get('regex'):
-            try:
-                # Coba kompilasi regex, jika gagal hentikan pencarian
-                re.compile(self.params['keyword'], re.IGNORECASE if not self.params.get('case_sensitive') else 0)
-            except re.error as e:
-                # Kembalikan file palsu/dummy sebagai notifikasi error atau panggil finish_callback
-                logger.error(f"Invalid regex: {e}")
-                finish_callback()
-                return
-            
         # Semantic Lazy Load
-        if self.params.get('semantic') and SentenceTransformer is not None:
-            global semantic_model
-            if semantic_model is None:
-                progress_callback("Loading AI Model (Mengunduh ~1GB pada pertama kali, mohon tunggu beberapa menit)...")
-                semantic_model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
-            self.keyword_embedding = semantic_model.encode(self.params['keyword'], convert_to_tensor=True)
+        if self.params.get('semantic') and SEMANTIC_AVAILABLE:
+            model_name = self.params.get('semantic_model') or DEFAULT_MODEL
+            backend = self.params.get('semantic_backend', 'torch')
+            quantize = self.params.get('semantic_quantize', False)
+            self.semantic_model = load_semantic_model(model_name, backend, quantize, progress_callback)
+            self.keyword_embedding = self.semantic_model.encode(self.params['keyword'], normalize_embeddings=True, convert_to_numpy=True)
+            if self.params.get('embedding_store', True):
+                self._embedding_store = get_embedding_store(
+                    os.path.join(self.index_dir_base, "embeddings"), model_id(model_name, backend, quantize),
+                    f"{SEMANTIC_CHAR_LIMIT}:{SEMANTIC_CHUNK_WIDTH}")
             
+        # Producer-consumer: walker mengisi antrean path (bounded) sementara worker langsung memindai,
+        # jadi hasil pertama muncul tanpa menunggu seluruh tree selesai di-walk.
+        path_queue = queue.Queue(maxsize=self.params.get('path_queue_size', 1000))
+        self._progress_lock = threading.Lock()
+        self._collected_count = 0
+        self._scanned_count = 0
+        walker_thread = threading.Thread(target=self._walk_into_queue, args=(path_queue, progress_callback, result_callback, index_snapshot), daemon=True)
+        walker_thread.start()
+        
         use_ai_ocr = self.params.get('semantic') or self.params.get('ocr')
+        max_workers = self.params.get('max_workers', 4)
         
         if use_ai_ocr:
             q_size = self.params.get('ai_queue_size', 50)
@@ -184,169 +646,788 @@ class SearchEngine:
             ai_worker_thread = threading.Thread(target=self._ai_worker, args=(ai_queue, progress_callback, result_callback))
             ai_worker_thread.start()
             
-            with ThreadPoolExecutor(max_workers=self.params.get('max_workers', 4)) as executor:
-                total = len(all_files)
-                for i, file_path in enumerate(all_files):
-                    if self.cancel_event.is_set():
+            # Tahap OCR terpisah: gambar dikirim ke process pool, collector meneruskan teksnya ke ai_queue
+            ocr_queue = ocr_thread = None
+            if self.params.get('ocr') and pytesseract is not None:
+                self._ocr_pool = get_ocr_pool(self.params.get('ocr_workers'), self.params.get('ocr_queue_size'))
+                ocr_queue = queue.Queue(maxsize=self.params.get('ocr_queue_size') or self._ocr_pool.workers * 2)
+                ocr_thread = threading.Thread(target=self._ocr_collector, args=(ocr_queue, ai_queue), daemon=True)
+                ocr_thread.start()
+            self._ocr_queue = ocr_queue
+            
+            # Pre-filter BM25: file dibaca & diberi skor dulu, hanya top-N yang di-encode model
+            prefilter_top = self.params.get('semantic_prefilter_top', 0)
+            if self.params.get('semantic') and SEMANTIC_AVAILABLE and prefilter_top > 0:
+                self._prefilter = BM25Prefilter(self.params['keyword'])
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for _ in range(max_workers):
+                    executor.submit(self._read_worker, path_queue, ai_queue, progress_callback)
+            
+            if self._prefilter is not None and not self.cancel_event.is_set():
+                candidates = self._prefilter.top(prefilter_top)
+                progress_callback(f"Semantic pre-filter: encoding {len(candidates)} of {len(self._prefilter)} files...")
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for entry in candidates:
+                        executor.submit(self._read_and_enqueue, entry, ai_queue)
+            
+            if ocr_thread is not None:
+                self._put_unless_cancelled(ocr_queue, None)
+                ocr_thread.join()
+                # Pool dipakai ulang pencarian berikutnya; job yang masih antre dari pencarian ini dibatalkan
+                while True:
+                    try:
+                        item = ocr_queue.get_nowait()
+                    except queue.Empty:
                         break
-                    progress_callback(f"Reading... {i+1}/{total}")
-                    executor.submit(self._read_and_enqueue, file_path, ai_queue)
+                    if item is not None:
+                        item[1].cancel()
+                self._ocr_pool = None
                     
-            ai_queue.put(None) # Sentinel to stop worker
+            # Sentinel to stop worker (jangan blok selamanya jika worker sudah berhenti karena cancel)
+            while ai_worker_thread.is_alive():
+                try:
+                    ai_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
             ai_worker_thread.join()
+        elif self.params.get('backend') == 'process':
+            self._run_process_scan(path_queue, progress_callback, result_callback)
         else:
-            with ThreadPoolExecutor(max_workers=self.params.get('max_workers', 4)) as executor:
-                future_to_file = {executor.submit(self._process_file, f): f for f in all_files}
-                
-                total = len(all_files)
-                for i, future in enumerate(as_completed(future_to_file)):
-                    if self.cancel_event.is_set():
-                        break
-                    
-                    progress_callback(f"Scanning... {i+1}/{total}")
-                    result = future.result()
-                    if result:
-                        result_callback(result)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for _ in range(max_workers):
+                    executor.submit(self._scan_worker, path_queue, progress_callback, result_callback)
         
+        walker_thread.join()
+        if self._embedding_store is not None:
+            self._embedding_store.flush()
         finish_callback()
 
-    def _read_and_enqueue(self, file_path, q):
+    def _walk_into_queue(self, path_queue, progress_callback, result_callback=None, index_snapshot=None):
+        store = self._embedding_store
+        embedded = [] # File yang embedding-nya sudah tersimpan: dinilai per batch tanpa dibaca ulang
+        try:
+            for entry in self._iter_files(progress_callback):
+                if store is not None and store.lookup(entry) is not None:
+                    embedded.append(entry)
+                    if len(embedded) >= EMBEDDED_SCORE_BATCH:
+                        self._score_embedded(store, embedded, result_callback)
+                        embedded = []
+                    continue
+                if index_snapshot is not None:
+                    states, hits, verify = index_snapshot
+                    key = self._path_key(entry.path)
+                    if self._is_fresh(entry, states.get(key)):
+                        # Isi file sama dengan versi di index: bukan hit berarti pasti tidak match
+                        if key not in hits:
+                            continue
+                        if not verify:
+                            hits.discard(key) # Search path yang tumpang tindih tidak menghasilkan duplikat
+                            result_callback(self._make_result(entry))
+                            continue
+                if not self._put_unless_cancelled(path_queue, entry):
+                    return
+                with self._progress_lock:
+                    self._collected_count += 1
+            if embedded and not self.cancel_event.is_set():
+                self._score_embedded(store, embedded, result_callback)
+        except Exception as e:
+            logger.error(f"File walker stopped unexpectedly: {e}")
+        finally:
+            self._put_unless_cancelled(path_queue, _WALK_DONE)
+
+    def _score_embedded(self, store, entries, result_callback):
+        scores = store.max_scores(entries, self.keyword_embedding)
+        for entry, score in zip(entries, scores):
+            if score > SEMANTIC_THRESHOLD:
+                result_callback(self._make_result(entry))
+
+    def _put_unless_cancelled(self, q, item):
+        while not self.cancel_event.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _iter_queue(self, path_queue):
+        while True:
+            try:
+                item = path_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.cancel_event.is_set(): return
+                continue
+            if item is _WALK_DONE:
+                path_queue.put(item) # Teruskan sentinel ke consumer lain
+                return
+            if self.cancel_event.is_set(): return
+            yield item
+
+    def _report_scanned(self, progress_callback, label):
+        with self._progress_lock:
+            self._scanned_count += 1
+            scanned, collected = self._scanned_count, self._collected_count
+        progress_callback(f"{label}... {scanned}/{collected}{self._binary_skip_note()}")
+
+    def _note_binary_skip(self):
+        with self._skip_lock:
+            self.binary_skipped += 1
+
+    def _binary_skip_note(self):
+        return f" (skipped {self.binary_skipped} binary)" if self.binary_skipped else ""
+
+    def _scan_worker(self, path_queue, progress_callback, result_callback):
+        for entry in self._iter_queue(path_queue):
+            # Error di satu file tidak boleh menghentikan worker, atau walker akan macet di antrean penuh
+            try:
+                result = self._process_file(entry)
+            except Exception as e:
+                logger.debug(f"Error processing {entry.path}: {e}")
+                result = None
+            self._report_scanned(progress_callback, "Scanning")
+            if result:
+                result_callback(result)
+
+    def _run_process_scan(self, path_queue, progress_callback, result_callback):
+        # Ekstraksi (fitz/docx) & matching terikat GIL, jadi dijalankan di proses terpisah.
+        # Path dikirim per chunk, yang kembali hanya list dict hasil yang kecil.
+        max_workers = self.params.get('max_workers', 4)
+        chunk_size = self.params.get('process_chunk_size', 32)
+        chunk_sizes = {}
+        
+        def _drain(futures):
+            for future in futures:
+                size = chunk_sizes.pop(future)
+                if future.cancelled(): continue
+                try:
+                    results, binary_skipped = future.result()
+                except Exception as e:
+                    logger.error(f"Scan worker process failed: {e}")
+                    results, binary_skipped = [], 0
+                with self._progress_lock:
+                    self._scanned_count += size
+                    self.binary_skipped += binary_skipped
+                    scanned, collected = self._scanned_count, self._collected_count
+                progress_callback(f"Scanning... {scanned}/{collected}{self._binary_skip_note()}")
+                for result in results:
+                    result_callback(result)
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_scan_process, initargs=(self.params,)) as executor:
+            for chunk in self._iter_chunks(path_queue, chunk_size):
+                future = executor.submit(_scan_chunk, chunk)
+                chunk_sizes[future] = len(chunk)
+                # Batasi chunk yang sedang berjalan agar antrean path tetap bounded
+                while len(chunk_sizes) >= max_workers * 2 and not self.cancel_event.is_set():
+                    done, _ = wait(list(chunk_sizes), timeout=0.1, return_when=FIRST_COMPLETED)
+                    _drain(done)
+                if self.cancel_event.is_set():
+                    break
+            
+            if self.cancel_event.is_set():
+                executor.shutdown(wait=False, cancel_futures=True)
+            while chunk_sizes and not self.cancel_event.is_set():
+                done, _ = wait(list(chunk_sizes), timeout=0.1, return_when=FIRST_COMPLETED)
+                _drain(done)
+
+    def _iter_chunks(self, path_queue, chunk_size):
+        chunk = []
+        for item in self._iter_queue(path_queue):
+            chunk.append(item)
+            # Kirim chunk lebih awal jika walker belum sempat mengisi antrean lagi
+            if len(chunk) >= chunk_size or path_queue.empty():
+                yield chunk
+                chunk = []
+        if chunk and not self.cancel_event.is_set():
+            yield chunk
+
+    def _read_worker(self, path_queue, ai_queue, progress_callback):
+        for entry in self._iter_queue(path_queue):
+            try:
+                if self._prefilter is not None:
+                    content = self._get_file_content(entry.path, entry)
+                    if content is not None:
+                        self._prefilter.add(entry, content[:SEMANTIC_CHAR_LIMIT])
+                else:
+                    self._read_and_enqueue(entry, ai_queue)
+            except Exception as e:
+                logger.debug(f"Error reading {entry.path}: {e}")
+            self._report_scanned(progress_callback, "Reading")
+
+    def _read_and_enqueue(self, entry, q):
         if self.cancel_event.is_set(): return
-        content = self._get_file_content(file_path)
+        if self._ocr_queue is not None and os.path.splitext(entry.path)[1].lower() in OCR_IMAGE_EXTENSIONS:
+            self._enqueue_ocr(entry, q)
+            return
+        content = self._get_file_content(entry.path, entry)
         if content is not None:
-            q.put((file_path, content))
+            self._put_unless_cancelled(q, (entry, content))
             
+    def _enqueue_ocr(self, entry, q):
+        # Teks OCR yang sudah di-cache langsung diteruskan, sisanya dikerjakan pool tanpa memblok pembaca
+        cache = self._text_cache()
+        content = cache.get(entry.path, entry.size, entry.modified, self._ocr_variant()) if cache else None
+        if content is not None:
+            self._put_unless_cancelled(q, (entry, content))
+            return
+        future = self._ocr_pool.submit_image(entry.path, *self._ocr_options(), cancel_event=self.cancel_event)
+        if future is not None:
+            self._put_unless_cancelled(self._ocr_queue, (entry, future))
+
+    def _ocr_collector(self, ocr_queue, ai_queue):
+        cache = self._text_cache()
+        while True:
+            try:
+                item = ocr_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.cancel_event.is_set(): return
+                continue
+            if item is None:
+                break
+            entry, future = item
+            if self.cancel_event.is_set():
+                future.cancel()
+                continue
+            try:
+                content = future.result()
+            except Exception as e:
+                logger.debug(f"OCR failed for {entry.path}: {e}")
+                continue
+            if cache:
+                cache.put(entry.path, entry.size, entry.modified, content, self._ocr_variant())
+            self._put_unless_cancelled(ai_queue, (entry, content))
+
+    def _ocr_variant(self):
+        # Teks OCR bergantung pada preprocessing gambar, jadi pengaturannya ikut jadi kunci cache
+        max_side = self.params.get('ocr_max_side', OCR_MAX_SIDE)
+        return f"ocr:{max_side}:{int(bool(self.params.get('ocr_binarize', False)))}"
+
+    def _ocr_image(self, file_path):
+        if self._ocr_pool is not None:
+            future = self._ocr_pool.submit_image(file_path, *self._ocr_options(), cancel_event=self.cancel_event)
+            return future.result() if future is not None else None
+        return image_text(file_path, *self._ocr_options())
+
+    def _ocr_options(self):
+        return self.params.get('ocr_max_side', OCR_MAX_SIDE), self.params.get('ocr_binarize', False)
+
+    def _ocr_pdf(self, file_path, page_count):
+        """Teks OCR halaman-halaman PDF, dikerjakan paralel di OCR pool jika ada.
+
+        Teks per halaman di-cache, jadi halaman yang sudah pernah di-OCR tidak dikerjakan ulang.
+        Untuk pencarian keyword, halaman lain dibatalkan begitu satu halaman match dan hasilnya
+        ditandai _PartialText agar tidak di-cache sebagai isi lengkap PDF.
+        """
+        dpi = self.params.get('ocr_pdf_dpi', PDF_OCR_DPI)
+        max_pages = self.params.get('ocr_pdf_max_pages', PDF_OCR_MAX_PAGES)
+        pages = range(min(page_count, max_pages) if max_pages else page_count)
+        cache = self._text_cache()
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        variant = f"{self._ocr_variant()}:{dpi}"
+        matcher = getattr(self, 'matcher', None) if not self.params.get('semantic') else None
+        
+        texts, todo = {}, []
+        for number in pages:
+            text = cache.get(f"{file_path}#page={number}", st.st_size, st.st_mtime, variant) if cache else None
+            if text is None:
+                todo.append(number)
+            else:
+                texts[number] = text
+        
+        def _done(number, future):
+            try:
+                text = future.result()
+            except Exception as e:
+                # Halaman yang gagal tidak di-cache; PDF-nya jadi _PartialText dan dicoba lagi lain kali
+                logger.debug(f"OCR failed for page {number + 1} of {file_path}: {e}")
+                return False
+            texts[number] = text
+            if cache:
+                cache.put(f"{file_path}#page={number}", st.st_size, st.st_mtime, text, variant)
+            return matcher is not None and matcher.match(text)
+        
+        def _joined(partial):
+            content = "\n".join(texts[number] for number in pages if number in texts)
+            return _PartialText(content) if partial else content
+        
+        if matcher is not None and any(matcher.match(text) for text in texts.values()):
+            return _joined(partial=len(texts) < len(pages))
+        if self._ocr_pool is None:
+            max_side, binarize = self._ocr_options()
+            for number in todo:
+                if self.cancel_event.is_set():
+                    return None
+                future = Future()
+                try:
+                    future.set_result(pdf_page_text(file_path, number, dpi, max_side, binarize))
+                except Exception as e:
+                    future.set_exception(e)
+                if _done(number, future):
+                    break
+            return _joined(partial=len(texts) < len(pages))
+        
+        futures = {}
+        matched = False
+        try:
+            for number in todo:
+                future = self._ocr_pool.submit_pdf_page(file_path, number, dpi, *self._ocr_options(), cancel_event=self.cancel_event)
+                if future is None:
+                    return None
+                futures[future] = number
+                # Cek halaman yang sudah selesai sambil mengirim sisanya
+                for done in [f for f in futures if f.done()]:
+                    if _done(futures.pop(done), done):
+                        matched = True
+                        break
+                if matched:
+                    break
+            while futures and not matched:
+                done, _ = wait(list(futures), timeout=0.1, return_when=FIRST_COMPLETED)
+                if self.cancel_event.is_set():
+                    return None
+                for future in done:
+                    if _done(futures.pop(future), future):
+                        matched = True
+                        break
+        finally:
+            for future in futures:
+                future.cancel()
+        return _joined(partial=len(texts) < len(pages))
+
     def _ai_worker(self, q, progress_callback, result_callback):
+        if self.params.get('semantic') and SEMANTIC_AVAILABLE:
+            self._semantic_batch_worker(q, result_callback)
+            return
         while not self.cancel_event.is_set():
             item = q.get()
             if item is None:
                 break
-            file_path, content = item
-            result = self._process_file_content(file_path, content)
+            entry, content = item
+            result = self._process_file_content(entry, content)
             if result:
                 result_callback(result)
             q.task_done()
 
+    def _semantic_batch_worker(self, q, result_callback):
+        # Chunk dari beberapa file digabung jadi satu batch encode; batch dikirim saat sudah berisi
+        # ai_batch_size chunk, atau ai_batch_wait detik setelah file pertama masuk batch.
+        batch_size = max(1, self.params.get('ai_batch_size', 64))
+        batch_wait = max(0.0, self.params.get('ai_batch_wait', 0.05))
+        batch, chunk_count, deadline = [], 0, None
+        finished = False
+        while not finished and not self.cancel_event.is_set():
+            try:
+                item = q.get(timeout=max(0.0, deadline - time.monotonic())) if batch else q.get()
+            except queue.Empty:
+                item = False # Waktu tunggu habis, kirim batch yang ada
+            if item is None:
+                finished = True
+            elif item:
+                entry, content = item
+                chunks = self._semantic_chunks(content)
+                if not batch:
+                    deadline = time.monotonic() + batch_wait
+                batch.append((entry, chunks))
+                chunk_count += len(chunks)
+                q.task_done()
+            if batch and (finished or chunk_count >= batch_size or time.monotonic() >= deadline):
+                try:
+                    for entry in self._semantic_matches(batch):
+                        result_callback(self._make_result(entry))
+                except Exception as e:
+                    logger.debug(f"Semantic batch of {len(batch)} files failed: {e}")
+                batch, chunk_count = [], 0
+
     def _collect_files(self, progress_callback):
-        files_to_scan = []
-        search_paths = self.params['search_paths']
+        return list(self._iter_files(progress_callback))
+
+    def _iter_files(self, progress_callback):
+        """Walk berbasis os.scandir; menghasilkan FileEntry dengan size/mtime dari DirEntry.
+
+        Di Windows stat sudah ikut terbaca saat listing direktori, jadi tidak ada syscall
+        tambahan per file (berarti besar untuk drive SMB/jaringan).
+        """
+        # Pola ignore dikompilasi sekali, bukan fnmatch per pola per file
+        self._path_filter = PathFilter(self.params['ignore_folders'], self.params['ignore_files'])
+        roots = [path for path in self.params['search_paths'] if os.path.isdir(path)]
+        walker_count = min(self.params.get('walker_workers', 1), 64)
+        if walker_count > 1:
+            yield from self._iter_files_parallel(roots, walker_count, progress_callback)
+            return
         
-        for path in search_paths:
-            if not os.path.isdir(path): continue
+        for path in roots:
+            pending = [(path, path)]
+            while pending:
+                if self.cancel_event.is_set(): return
+                files, subdirs = self._scan_directory(pending.pop(), progress_callback)
+                yield from files
+                # Urutan depth-first seperti os.walk(topdown=True)
+                pending.extend(reversed(subdirs))
+
+    def _scan_directory(self, task, progress_callback):
+        # task = (folder yang di-scan, folder pencarian asalnya) untuk pola ignore relatif
+        directory, search_root = task
+        progress_callback(f"Collecting in: {os.path.basename(directory)}")
+        try:
+            with os.scandir(directory) as it:
+                dir_entries = list(it)
+        except OSError:
+            return [], [] # Skip inaccessible drives/folders
+        
+        path_filter = self._path_filter
+        files, subdirs = [], []
+        for dir_entry in dir_entries:
             try:
-                for root, dirs, filenames in os.walk(path, topdown=True):
-                    if self.cancel_event.is_set(): return []
-                    
-                    progress_callback(f"Collecting in: {os.path.basename(root)}")
-                    
-                    dirs[:] = [d for d in dirs if d not in self.params['ignore_folders']]
-                    
-                    for filename in filenames:
-                        if any(fnmatch.fnmatch(filename, pattern) for pattern in self.params['ignore_files']):
-                            continue
-                        
-                        file_path = os.path.join(root, filename)
-                        try:
-                            stat_info = os.stat(file_path)
-                            if not self._check_size(stat_info.st_size, self.params['size_filters']): continue
-                            if not self._check_date(stat_info.st_mtime, self.params['date_filters']): continue
-                            files_to_scan.append(file_path)
-                        except OSError:
-                            continue
-            except Exception:
-                continue # Skip inaccessible drives/folders
-        return files_to_scan
+                if dir_entry.is_dir(follow_symlinks=False):
+                    if not path_filter.skip_dir(dir_entry.name, dir_entry.path, search_root) and not self.is_app_data_path(dir_entry.path):
+                        subdirs.append((dir_entry.path, search_root))
+                    continue
+                if not dir_entry.is_file():
+                    continue
+                if path_filter.skip_file(dir_entry.name, dir_entry.path, search_root):
+                    continue
+                stat_info = dir_entry.stat()
+            except OSError:
+                continue
+            if not self._check_size(stat_info.st_size, self.params['size_filters']): continue
+            if not self._check_date(stat_info.st_mtime, self.params['date_filters']): continue
+            files.append(FileEntry(dir_entry.path, stat_info.st_size, stat_info.st_mtime))
+        return files, subdirs
 
-    def _process_file(self, file_path):
-        content = self._get_file_content(file_path)
-        return self._process_file_content(file_path, content)
+    def _iter_files_parallel(self, roots, walker_count, progress_callback):
+        # Tiap walker punya deque direktori sendiri (root dibagi round-robin). Walker mengambil dari
+        # ujung deque-nya sendiri (depth-first) dan jika kosong mencuri dari depan deque walker lain,
+        # yaitu direktori tertua yang biasanya berisi subtree terbesar.
+        deques = [deque() for _ in range(walker_count)]
+        for i, root in enumerate(roots):
+            deques[i % walker_count].append((root, root))
+        outstanding = [len(roots)] # Direktori yang masih di deque atau sedang di-scan
+        outstanding_lock = threading.Lock()
+        out_queue = queue.Queue(maxsize=self.params.get('path_queue_size', 1000))
+        stop_event = threading.Event()
+        
+        def _take(index):
+            try:
+                return deques[index].pop()
+            except IndexError:
+                pass
+            for offset in range(1, walker_count):
+                try:
+                    return deques[(index + offset) % walker_count].popleft()
+                except IndexError:
+                    continue
+            return None
+        
+        def _put(item):
+            while not (self.cancel_event.is_set() or stop_event.is_set()):
+                try:
+                    out_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def _walker(index):
+            try:
+                while not (self.cancel_event.is_set() or stop_event.is_set()):
+                    directory = _take(index)
+                    if directory is None:
+                        with outstanding_lock:
+                            if outstanding[0] == 0: return
+                        time.sleep(0.005) # Walker lain masih scan, tunggu ada subdir yang bisa dicuri
+                        continue
+                    try:
+                        files, subdirs = self._scan_directory(directory, progress_callback)
+                        with outstanding_lock:
+                            outstanding[0] += len(subdirs)
+                        deques[index].extend(reversed(subdirs))
+                        for entry in files:
+                            if not _put(entry): return
+                    finally:
+                        with outstanding_lock:
+                            outstanding[0] -= 1
+            finally:
+                _put(_WALK_DONE)
+        
+        threads = [threading.Thread(target=_walker, args=(i,), daemon=True) for i in range(walker_count)]
+        for t in threads: t.start()
+        try:
+            finished = 0
+            while finished < walker_count:
+                try:
+                    item = out_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self.cancel_event.is_set(): return
+                    continue
+                if self.cancel_event.is_set(): return
+                if item is _WALK_DONE:
+                    finished += 1
+                else:
+                    yield item
+        finally:
+            stop_event.set()
+
+    def _process_file(self, entry):
+        file_path = entry.path
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in ARCHIVE_EXTENSIONS and self._has_extractor(ext) and not self.params.get('semantic'):
+            # Member dicari satu per satu dan berhenti di member pertama yang match
+            member = self._scan_archive(file_path, ext)
+            return self._make_result(entry, member) if member else None
+        if self._has_extractor(ext):
+            content = self._get_file_content(file_path, entry)
+            return self._process_file_content(entry, content)
+        
+        if entry.size == 0:
+            return None
+        try:
+            kind = self._sniff_plain_file(file_path, ext)
+            if kind == "binary":
+                self._note_binary_skip()
+                return None
+            if self.matcher.byte_needles(['utf-8']) is not None:
+                # Fast path file teks biasa: cari langsung di bytes lewat mmap tanpa decode seluruh file
+                matched = self._scan_plain_file(file_path, kind)
+            else:
+                # Baca per chunk dan berhenti di match pertama, tanpa memuat seluruh file
+                matched = self._scan_text_stream(file_path, 'utf-16' if kind == "utf-16" else 'utf-8')
+        except (OSError, ValueError) as e:
+            logger.debug(f"Error scanning {file_path}: {e}")
+            return None
+        return self._make_result(entry) if matched else None
+
+    def _sniff_plain_file(self, file_path, ext):
+        """Mengembalikan "binary", "utf-16" atau "text" dari ekstensi dan beberapa KB pertama file."""
+        if ext in BINARY_EXTENSIONS:
+            return "binary"
+        with open(file_path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+        if not head:
+            return "text"
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return "utf-16"
+        if b'\x00' in head:
+            # UTF-16 tanpa BOM: NUL hampir hanya di posisi genap atau hanya di posisi ganjil
+            even_nul, odd_nul = head[0::2].count(0), head[1::2].count(0)
+            half = len(head) / 2
+            if (odd_nul > half * 0.3 and even_nul < half * 0.02) or (even_nul > half * 0.3 and odd_nul < half * 0.02):
+                return "utf-16"
+            return "binary"
+        non_text = len(head.translate(None, _TEXT_BYTES))
+        return "binary" if non_text > len(head) * 0.3 else "text"
+
+    def _scan_text_stream(self, file_path, encoding='utf-8'):
+        with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
+            return self._match_stream(f)
 
-    def _process_file_content(self, file_path, content):
+    def _match_stream(self, f):
+        """Cocokkan stream teks per chunk dan berhenti di match pertama, tanpa memuat seluruh isinya."""
+        chunk_size = self.params.get('chunk_size', CASEFOLD_WINDOW)
+        matcher = self.matcher
+        tail, start = '', 0
+        while not self.cancel_event.is_set():
+            chunk = f.read(chunk_size)
+            is_last = len(chunk) < chunk_size
+            window = tail + chunk
+            if matcher.match_window(window, start, len(window) if is_last else len(window) - matcher.guard):
+                return True
+            if is_last:
+                return False
+            # `guard` karakter pertama jendela berikutnya hanya konteks (untuk \b/lookbehind);
+            # match yang mulai di sana sudah dinilai di jendela ini
+            carry = matcher.overlap + matcher.guard
+            tail = window[-carry:] if carry else ''
+            start = max(0, len(tail) - matcher.overlap)
+        return False
+
+    def _iter_archive_members(self, file_path, ext):
+        """(nama member, stream bytes) untuk setiap file di arsip, satu per satu.
+
+        Member biner (dari ekstensinya) dan member yang melebihi batas ukuran dilewati. Stream
+        hanya valid sampai iterasi berikutnya.
+        """
+        max_bytes = self.params.get('archive_member_max_mb', ARCHIVE_MEMBER_MAX_MB) * 1024 * 1024
+        if ext == ".zip":
+            with zipfile.ZipFile(file_path, 'r') as zf:
+                for info in zf.infolist():
+                    if info.is_dir() or self._skip_archive_member(file_path, info.filename, info.file_size, max_bytes):
+                        continue
+                    try:
+                        with zf.open(info) as member:
+                            yield info.filename, member
+                    except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError) as e:
+                        logger.debug(f"Error reading zip entry {info.filename} in {file_path}: {e}")
+        else:
+            # Iterasi langsung (bukan getmembers) agar tar tidak di-scan sampai habis sebelum mulai
+            with tarfile.open(file_path, 'r:*') as tf:
+                for member in tf:
+                    if not member.isreg() or self._skip_archive_member(file_path, member.name, member.size, max_bytes):
+                        continue
+                    f = tf.extractfile(member)
+                    if f:
+                        with f:
+                            yield member.name, f
+
+    def _skip_archive_member(self, file_path, name, size, max_bytes):
+        if os.path.splitext(name)[1].lower() in BINARY_EXTENSIONS:
+            return True
+        if max_bytes and size > max_bytes:
+            logger.debug(f"Skipping {name} in {file_path}: {size} bytes exceeds the archive member limit")
+            return True
+        return False
+
+    def _scan_archive(self, file_path, ext):
+        """Nama member pertama yang match, atau None."""
+        try:
+            for name, member in self._iter_archive_members(file_path, ext):
+                if self.cancel_event.is_set():
+                    return None
+                try:
+                    if self._match_stream(io.TextIOWrapper(member, encoding='utf-8', errors='ignore')):
+                        return name
+                except (OSError, EOFError, zlib.error, zipfile.BadZipFile) as e:
+                    logger.debug(f"Error reading {name} in {file_path}: {e}")
+        except Exception as e:
+            logger.debug(f"Error reading archive {file_path}: {e}")
+        return None
+
+    def _scan_plain_file(self, file_path, kind):
+        encodings = ['utf-8']
+        if kind == "utf-16":
+            encodings += ['utf-16-le', 'utf-16-be']
+        needles = self.matcher.byte_needles(encodings)
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if self.matcher.case_sensitive:
+                    return any(mm.find(needle) != -1 for needle in needles)
+                window_size = self.params.get('chunk_size', CASEFOLD_WINDOW)
+                overlap = max(len(needle) for needle in needles) - 1
+                for start in range(0, len(mm), window_size):
+                    window = mm[start:start + window_size + overlap].lower()
+                    if any(needle in window for needle in needles):
+                        return True
+                return False
+
+    def _has_extractor(self, ext):
+        # Harus sinkron dengan percabangan di _get_file_content; False berarti file dibaca sebagai teks biasa
+        if ext in (".zip", ".tar"): return bool(self.params.get('archive'))
+        if ext == ".pdf": return fitz is not None
+        if ext == ".docx": return docx is not None
+        if ext in OCR_IMAGE_EXTENSIONS: return bool(self.params.get('ocr')) and pytesseract is not None
+        if ext == ".mp3": return mutagen is not None
+        if ext == ".eml": return True
+        if ext == ".msg": return extract_msg is not None
+        if ext == ".epub": return ebooklib is not None
+        return False
+
+    def _make_result(self, entry, member=None):
+        result = {"name": os.path.basename(entry.path), "path": entry.path, "size": entry.size, "modified": entry.modified}
+        if member:
+            # Path tetap path arsip agar bisa dibuka; nama menunjukkan member yang match
+            result["name"] += f"!/{member}"
+            result["member"] = member
+        return result
+
+    def _process_file_content(self, entry, content):
         if content is None: return None
 
-        keyword = self.params['keyword']
-        k, c = (keyword, content) if self.params.get('case_sensitive') else (keyword.lower(), content.lower())
-        
         match = False
         try:
-            if self.params.get('semantic') and SentenceTransformer is not None:
-                # Limit to first 10,000 characters to prevent OOM
-                c_limit = content[:10000]
-                # Better chunking for long text using textwrap
-                chunks = textwrap.wrap(c_limit, width=500, break_long_words=False) if len(c_limit) > 500 else [c_limit]
-                chunk_embeddings = semantic_model.encode(chunks, convert_to_tensor=True)
-                cos_scores = util.cos_sim(self.keyword_embedding, chunk_embeddings)[0]
-                if max(cos_scores) > 0.65: # Threshold dinaikkan untuk akurasi > 90%
-                    match = True
-            elif self.params.get('regex'):
-                match = bool(re.search(k, c, re.IGNORECASE if not self.params.get('case_sensitive') else 0))
-            elif self.params.get('fuzzy'):
-                try:
-                    from thefuzz import fuzz
-                    if fuzz.partial_ratio(keyword.lower(), content.lower()) >= 80:
-                        match = True
-                except ImportError:
-                    pass
-            elif self.params.get('whole_word'):
-                match = bool(re.search(r'\b' + re.escape(k) + r'\b', c))
-            elif k in c:
-                match = True
+            if self.params.get('semantic') and SEMANTIC_AVAILABLE:
+                match = bool(self._semantic_matches([(entry, self._semantic_chunks(content))]))
+            else:
+                match = self.matcher.match(content)
         except Exception:
             return None
             
         if match:
-            stat = os.stat(file_path)
-            return {"name": os.path.basename(file_path), "path": file_path, "size": stat.st_size, "modified": stat.st_mtime}
+            return self._make_result(entry)
         return None
 
-    def _get_file_content(self, file_path):
+    def _semantic_chunks(self, content):
+        c_limit = content[:SEMANTIC_CHAR_LIMIT]
+        # Better chunking for long text using textwrap
+        chunks = textwrap.wrap(c_limit, width=SEMANTIC_CHUNK_WIDTH, break_long_words=False) if len(c_limit) > SEMANTIC_CHUNK_WIDTH else []
+        return chunks or [c_limit]
+
+    def _semantic_matches(self, batch):
+        """Encode chunk dari beberapa file (list of (entry, chunks)) sekaligus; return entry yang match."""
+        all_chunks = [chunk for _, chunks in batch for chunk in chunks]
+        embeddings = self.semantic_model.encode(all_chunks, batch_size=max(1, self.params.get('ai_batch_size', 64)),
+                                                normalize_embeddings=True, convert_to_numpy=True)
+        # Embedding sudah dinormalisasi, jadi cosine similarity = dot product
+        scores = embeddings @ self.keyword_embedding
+        matches, start = [], 0
+        for entry, chunks in batch:
+            end = start + len(chunks)
+            if self._embedding_store is not None:
+                self._embedding_store.add(entry, embeddings[start:end])
+            if scores[start:end].max() > SEMANTIC_THRESHOLD:
+                matches.append(entry)
+            start = end
+        return matches
+
+    def _text_cache(self):
+        max_mb = self.params.get('text_cache_mb', 512)
+        if not max_mb or self._text_cache_failed: return None
+        try:
+            return get_text_cache(os.path.join(self.index_dir_base, "text_cache"), max_mb)
+        except OSError as e:
+            # Folder cache tidak bisa dibuat (mis. home read-only): ekstraksi tetap jalan tanpa cache
+            logger.warning(f"Text cache unavailable, extracting without cache: {e}")
+            self._text_cache_failed = True
+            return None
+
+    def _get_file_content(self, file_path, entry=None):
         ext = os.path.splitext(file_path)[1].lower()
+        cache = self._text_cache() if ext in CACHED_EXTRACTIONS and self._has_extractor(ext) else None
+        if cache is None:
+            return self._extract_file_content(file_path, ext)
+        
+        # Hasil ekstraksi PDF berbeda jika OCR aktif, jadi dibedakan lewat variant
+        variant = self._ocr_variant() if self.params.get('ocr') else ""
+        if variant and ext == ".pdf":
+            variant += f":{self.params.get('ocr_pdf_dpi', PDF_OCR_DPI)}:{self.params.get('ocr_pdf_max_pages', PDF_OCR_MAX_PAGES)}"
+        if entry is None:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return None
+            entry = FileEntry(file_path, stat.st_size, stat.st_mtime)
+        content = cache.get(file_path, entry.size, entry.modified, variant)
+        if content is None:
+            content = self._extract_file_content(file_path, ext)
+            if content is not None and not isinstance(content, _PartialText):
+                cache.put(file_path, entry.size, entry.modified, content, variant)
+        return content
+
+    def _extract_file_content(self, file_path, ext):
         content = ""
         try:
-            if ext == ".zip" and self.params.get('archive'):
-                import zipfile
-                with zipfile.ZipFile(file_path, 'r') as zf:
-                    for name in zf.infolist():
-                        if not name.is_dir():
-                            try: content += zf.read(name).decode('utf-8', 'ignore') + "\n"
-                            except Exception as e:
-                                logger.debug(f"Error reading zip entry {name} in {file_path}: {e}")
-                                continue
-            elif ext == ".tar" and self.params.get('archive'):
-                import tarfile
-                with tarfile.open(file_path, 'r:*') as tf:
-                    for member in tf.getmembers():
-                        if member.isreg():
-                            f = tf.extractfile(member)
-                            if f:
-                                try: content += f.read().decode('utf-8', 'ignore') + "\n"
-                                except Exception as e:
-                                    logger.debug(f"Error reading tar member {member.name} in {file_path}: {e}")
-                                    continue
+            if ext in ARCHIVE_EXTENSIONS and self.params.get('archive'):
+                parts = []
+                for name, member in self._iter_archive_members(file_path, ext):
+                    try: parts.append(member.read().decode('utf-8', 'ignore'))
+                    except Exception as e:
+                        logger.debug(f"Error reading {name} in {file_path}: {e}")
+                        continue
+                content = "\n".join(parts)
             elif ext == ".pdf" and fitz:
-                with fitz.open(file_path) as doc: content = "".join(page.get_text() for page in doc)
-                if self.params.get('ocr') and pytesseract and not content.strip():
-                     # if no text found, try OCR on the first page
-                     with fitz.open(file_path) as doc:
-                         if doc.page_count > 0:
-                             pix = doc[0].get_pixmap()
-                             img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                             content = pytesseract.image_to_string(img)
+                with fitz.open(file_path) as doc:
+                    content = "".join(page.get_text() for page in doc)
+                    page_count = doc.page_count
+                if self.params.get('ocr') and pytesseract and not content.strip() and page_count:
+                    # PDF hasil scan tanpa layer teks: OCR semua halaman
+                    content = self._ocr_pdf(file_path, page_count)
             elif ext == ".docx" and docx:
                 doc = docx.Document(file_path)
                 content = "\n".join(para.text for para in doc.paragraphs)
-            elif ext in [".png", ".jpg", ".jpeg"] and self.params.get('ocr') and pytesseract:
-                img = Image.open(file_path)
-                content = pytesseract.image_to_string(img)
-                # also extract EXIF
-                exif_data = img.getexif()
-                if exif_data:
-                    for tag_id in exif_data:
-                        tag = TAGS.get(tag_id, tag_id)
-                        data = exif_data.get(tag_id)
-                        if isinstance(data, bytes):
-                            data = data.decode(errors='ignore')
-                        content += f"\n{tag}: {data}"
+            elif ext in OCR_IMAGE_EXTENSIONS and self.params.get('ocr') and pytesseract:
+                content = self._ocr_image(file_path)
             elif ext == ".mp3" and mutagen:
                 audio = mutagen.File(file_path, easy=True)
                 if audio:
@@ -368,7 +1449,12 @@ class SearchEngine:
                     soup = BeautifulSoup(item.get_body_content(), 'html.parser')
                     content += soup.get_text() + "\n"
             else:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                kind = self._sniff_plain_file(file_path, ext)
+                if kind == "binary":
+                    self._note_binary_skip()
+                    return None
+                # Sama dengan _process_file: teks UTF-16 dibaca sebagai UTF-16, bukan UTF-8 berisi NUL
+                with open(file_path, 'r', encoding='utf-16' if kind == "utf-16" else 'utf-8', errors='ignore') as f:
                     # content = f.read(10*1024*1024) # Read up to 10MB
                     # content = f.read(100 * 1024 * 1024)
                     content = f.read()
@@ -384,9 +1470,47 @@ class SearchEngine:
         if op == 'less than': return file_size < val
         return True
 
+    def _date_bounds(self, filters):
+        # Batas tanggal diubah ke epoch sekali per pencarian, bukan datetime.fromtimestamp per file
+        if not filters: return None, None
+        cached = getattr(self, '_date_bounds_cache', None)
+        if cached is None or cached[0] is not filters:
+            after, before = filters.get('after'), filters.get('before')
+            cached = self._date_bounds_cache = (filters, after.timestamp() if after else None, before.timestamp() if before else None)
+        return cached[1], cached[2]
+
     def _check_date(self, mod_timestamp, filters):
         if not filters: return True
-        mod_dt = datetime.fromtimestamp(mod_timestamp)
-        after_ok = not filters['after'] or mod_dt > filters['after']
-        before_ok = not filters['before'] or mod_dt < filters['before']
-        return after_ok and before_ok
\ No newline at end of file
+        after_ts, before_ts = self._date_bounds(filters)
+        after_ok = after_ts is None or mod_timestamp > after_ts
+        before_ok = before_ts is None or mod_timestamp < before_ts
+        return after_ok and before_ok
+
+
+# --- Process-pool backend ---
+# Engine dibuat sekali per proses worker (lewat initializer), bukan per chunk.
+_process_engine = None
+
+def _init_scan_process(search_params):
+    global _process_engine
+    _process_engine = SearchEngine(search_params, threading.Event())
+    # Saat build index tidak ada keyword, worker hanya dipakai untuk ekstraksi
+    _process_engine.matcher = build_matcher(search_params) if search_params.get('keyword') is not None else None
+
+def _scan_chunk(entries):
+    results = []
+    skipped_before = _process_engine.binary_skipped
+    for entry in entries:
+        try:
+            result = _process_engine._process_file(entry)
+        except Exception as e:
+            logger.debug(f"Error processing {entry.path}: {e}")
+            continue
+        if result:
+            results.append(result)
+    return results, _process_engine.binary_skipped - skipped_before
+
+def _extract_chunk(entries):
+    skipped_before = _process_engine.binary_skipped
+    outcome = _process_engine._extract_index_chunk(entries)
+    return outcome, _process_engine.binary_skipped - skipped_before
\ No newline at end of file
@@ -0,0 +1,155 @@
+# app/core/semantic_models.py
+import os
+import sys
+import glob
+import time
+import logging
+import threading
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers & torch baru di-import saat model pertama dimuat: import-nya butuh beberapa
+# detik dan ratusan MB, padahal proses worker scan/OCR (spawn) juga meng-import modul engine
+SEMANTIC_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_MODEL = 'paraphrase-multilingual-mpnet-base-v2'
+# Backend inference yang didukung sentence-transformers >= 3.2 (parameter backend=)
+BACKENDS = ('torch', 'onnx', 'openvino')
+# Model alternatif yang lebih ringan; nama model Hugging Face atau path folder lokal juga bisa dipakai
+LIGHT_MODELS = (
+    'paraphrase-multilingual-MiniLM-L12-v2',
+    'all-MiniLM-L6-v2',
+)
+ONNX_QUANTIZATION = 'avx2' # Konfigurasi kuantisasi int8 yang jalan di hampir semua CPU x86-64
+
+_models = {}
+_models_lock = threading.RLock()
+
+
+def model_id(name, backend='torch', quantize=False):
+    """Identitas model untuk embedding store; embedding dari backend/kuantisasi berbeda tidak dicampur."""
+    name = os.path.abspath(name) if os.path.isdir(name) else name
+    return f"{name}|{backend}{'|int8' if quantize else ''}"
+
+
+def _quantized_onnx_file(model_dir):
+    """Path relatif file ONNX int8 di dalam folder model lokal, atau None."""
+    for pattern in ('*qint8*.onnx', '*quantized*.onnx'):
+        found = sorted(glob.glob(os.path.join(model_dir, 'onnx', pattern)) + glob.glob(os.path.join(model_dir, pattern)))
+        if found:
+            return os.path.relpath(found[0], model_dir).replace(os.sep, '/')
+    return None
+
+
+def _load(name, backend, quantize):
+    from sentence_transformers import SentenceTransformer
+    local = os.path.isdir(name)
+    kwargs = {'local_files_only': True} if local else {}
+    if backend != 'torch':
+        kwargs['backend'] = backend
+    if backend == 'onnx' and quantize and local:
+        file_name = _quantized_onnx_file(name)
+        if file_name is None:
+            # Ekspor sekali ke folder model; pencarian berikutnya langsung memuat file int8-nya
+            try:
+                from sentence_transformers import export_dynamic_quantized_onnx_model
+                export_dynamic_quantized_onnx_model(SentenceTransformer(name, **kwargs), ONNX_QUANTIZATION, name)
+                file_name = _quantized_onnx_file(name)
+            except Exception as e:
+                logger.warning(f"Cannot export int8 ONNX model to {name}, using fp32 ONNX: {e}")
+        if file_name:
+            kwargs['model_kwargs'] = {'file_name': file_name}
+    elif backend == 'onnx' and quantize:
+        # Repo Hugging Face yang sudah menyertakan varian ONNX int8 (mis. model sentence-transformers)
+        kwargs['model_kwargs'] = {'file_name': f"onnx/model_qint8_{ONNX_QUANTIZATION}.onnx"}
+
+    model = SentenceTransformer(name, device='cpu' if backend != 'torch' or quantize else None, **kwargs)
+    if backend == 'torch' and quantize:
+        import torch
+        # Kuantisasi dinamis: bobot Linear disimpan int8, aktivasi dikuantisasi saat inference (CPU)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def load_semantic_model(name=DEFAULT_MODEL, backend='torch', quantize=False, progress_callback=None):
+    """Model sentence-transformers untuk (name, backend, quantize), dimuat sekali per proses.
+
+    name boleh nama model Hugging Face atau path folder lokal (dimuat tanpa akses jaringan).
+    Semua varian punya interface encode() yang sama. Return None jika sentence-transformers
+    tidak terpasang.
+    """
+    if not SEMANTIC_AVAILABLE:
+        return None
+    name = name or DEFAULT_MODEL
+    backend = backend if backend in BACKENDS else 'torch'
+    key = model_id(name, backend, quantize)
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            if progress_callback:
+                if os.path.isdir(name):
+                    progress_callback(f"Loading AI Model from {name}...")
+                else:
+                    progress_callback("Loading AI Model (Mengunduh ~1GB pada pertama kali, mohon tunggu beberapa menit)...")
+            try:
+                model = _load(name, backend, quantize)
+            except Exception as e:
+                if backend == 'torch' and not quantize:
+                    raise
+                # Backend opsional (onnxruntime / openvino) belum terpasang atau file model tidak ada
+                logger.warning(f"Cannot load {name} with backend={backend} int8={quantize}, falling back to torch: {e}")
+                model = load_semantic_model(name, 'torch', False, progress_callback)
+            _models[key] = model
+        return model
+
+
+def benchmark(texts, queries, candidates, reference=None, top_k=10, batch_size=64):
+    """Bandingkan throughput encode & recall beberapa varian model terhadap model referensi.
+
+    candidates: list of (name, backend, quantize). Recall@top_k dihitung dari irisan top_k
+    dokumen per query antara kandidat dan reference (default: model bawaan fp32).
+    Return list of dict per kandidat.
+    """
+    reference = reference or (DEFAULT_MODEL, 'torch', False)
+
+    def run(name, backend, quantize):
+        model = load_semantic_model(name, backend, quantize)
+        start = time.perf_counter()
+        doc_vectors = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        elapsed = time.perf_counter() - start
+        query_vectors = model.encode(queries, normalize_embeddings=True, convert_to_numpy=True)
+        ranking = np.argsort(-(query_vectors @ doc_vectors.T), axis=1)[:, :top_k]
+        return len(texts) / elapsed if elapsed else float('inf'), ranking
+
+    _, expected = run(*reference)
+    results = []
+    for name, backend, quantize in candidates:
+        throughput, ranking = run(name, backend, quantize)
+        recall = sum(len(set(got) & set(want)) for got, want in zip(ranking, expected)) / expected.size
+        results.append({'model': model_id(name, backend, quantize), 'texts_per_sec': throughput, f'recall@{top_k}': recall})
+    return results
+
+
+if __name__ == '__main__':
+    # python -m app.core.semantic_models <folder teks> "<query>" ["<query>" ...]
+    import textwrap
+    if len(sys.argv) < 3:
+        sys.exit("usage: python -m app.core.semantic_models FOLDER QUERY [QUERY ...]")
+    chunks = []
+    for root, _dirs, files in os.walk(sys.argv[1]):
+        for file in files:
+            try:
+                with open(os.path.join(root, file), encoding='utf-8', errors='ignore') as f:
+                    chunks.extend(textwrap.wrap(f.read(10000), width=500, break_long_words=False))
+            except OSError:
+                continue
+    candidates = [(DEFAULT_MODEL, 'torch', True), (DEFAULT_MODEL, 'onnx', False), (DEFAULT_MODEL, 'onnx', True)]
+    candidates += [(name, 'torch', False) for name in LIGHT_MODELS]
+    for row in benchmark(chunks, sys.argv[2:], [(DEFAULT_MODEL, 'torch', False)] + candidates):
+        print(row)
@@ -0,0 +1,144 @@
+# app/core/text_cache.py
+import os
+import zlib
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CACHE_EXT = ".zst" if zstandard else ".zlib"
+
+
+class TextCache:
+    """Cache teks hasil ekstraksi di disk, dikunci dengan (path, size, mtime).
+
+    Setiap entry adalah satu file terkompresi (zstandard, atau zlib jika zstandard tidak ada).
+    Waktu modifikasi file entry dipakai sebagai penanda LRU: disentuh setiap kali dibaca,
+    dan entry tertua dibuang saat total ukuran melewati batas.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, file_path, variant):
+        key = f"{os.path.normpath(file_path)}|{variant}"
+        return os.path.join(self.cache_dir, hashlib.md5(key.encode('utf-8')).hexdigest() + CACHE_EXT)
+
+    @staticmethod
+    def _header(size, mtime):
+        return f"{size}:{mtime!r}\n".encode('ascii')
+
+    def get(self, file_path, size, mtime, variant=""):
+        entry = self._entry_path(file_path, variant)
+        try:
+            with open(entry, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        header, _, payload = data.partition(b"\n")
+        if header + b"\n" != self._header(size, mtime):
+            return None # File sumber sudah berubah, entry akan ditimpa saat put berikutnya
+        try:
+            text = self._decompress(payload).decode('utf-8')
+        except Exception as e:
+            logger.debug(f"Corrupt text cache entry {entry}: {e}")
+            return None
+        try:
+            os.utime(entry) # Tandai sebagai baru dipakai (LRU)
+        except OSError:
+            pass
+        return text
+
+    def put(self, file_path, size, mtime, text, variant=""):
+        entry = self._entry_path(file_path, variant)
+        data = self._header(size, mtime) + self._compress(text.encode('utf-8', 'surrogatepass'))
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = f"{entry}.{threading.get_ident()}.tmp"
+        try:
+            old_size = os.path.getsize(entry) if os.path.exists(entry) else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, entry)
+        except OSError as e:
+            logger.debug(f"Cannot write text cache entry for {file_path}: {e}")
+            try: os.remove(tmp_path)
+            except OSError: pass
+            return
+        with self._lock:
+            try:
+                if self._total_bytes is None:
+                    self._total_bytes = self._scan_total()
+                else:
+                    self._total_bytes += len(data) - old_size
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+            except OSError as e:
+                # Entry sudah tertulis; total dihitung ulang dari disk pada put berikutnya
+                logger.debug(f"Cannot update text cache size in {self.cache_dir}: {e}")
+                self._total_bytes = None
+
+    def _scan_entries(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for e in it:
+                if e.name.endswith(CACHE_EXT):
+                    try:
+                        st = e.stat()
+                        entries.append((st.st_mtime, st.st_size, e.path))
+                    except OSError:
+                        continue
+        return entries
+
+    def _scan_total(self):
+        return sum(size for _, size, _ in self._scan_entries())
+
+    def _evict(self):
+        # Buang entry yang paling lama tidak dipakai sampai tersisa ~90% dari batas
+        entries = sorted(self._scan_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target: break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    @staticmethod
+    def _compress(data):
+        if zstandard:
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return zlib.compress(data, 6)
+
+    @staticmethod
+    def _decompress(data):
+        if zstandard:
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_text_cache(cache_dir, max_mb):
+    """Satu instance TextCache per folder per proses, dipakai bersama oleh semua worker thread."""
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = _caches[cache_dir] = TextCache(cache_dir, max_mb * 1024 * 1024)
+        else:
+            cache.max_bytes = max_mb * 1024 * 1024
+        return cache
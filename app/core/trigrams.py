@@ -0,0 +1,99 @@
+# app/core/trigrams.py
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError: # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+try:
+    from whoosh.query import And, Or, Term
+except ImportError:
+    And = None
+
+GRAM_FIELD = "grams"
+GRAM_SIZE = 3
+# Batas trigram per literal di query; literal panjang sudah cukup selektif dengan sebagian trigramnya
+MAX_GRAMS_PER_LITERAL = 32
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+def text_trigrams(text):
+    """Trigram unik (lowercase) dari teks, dipisah spasi untuk field KEYWORD di index.
+
+    Trigram yang mengandung whitespace tidak diindex, jadi cukup dihitung per kata unik.
+    """
+    grams = set()
+    for word in set(text.lower().split()):
+        for i in range(len(word) - GRAM_SIZE + 1):
+            grams.add(word[i:i + GRAM_SIZE])
+    return ' '.join(grams)
+
+
+def _required_literals(parsed):
+    """Struktur literal yang wajib ada di setiap match: ('and'|'or', [str | node, ...])."""
+    required, run = [], []
+
+    def flush():
+        if run:
+            required.append(''.join(run))
+            run.clear()
+
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            required.append(_required_literals(av[-1]))
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            required.append(_required_literals(av))
+        elif op is sre_constants.BRANCH:
+            required.append(('or', [_required_literals(branch) for branch in av[1]]))
+        elif op in _REPEATS:
+            low, _high, item = av
+            if low >= 1:
+                required.append(_required_literals(item))
+        # Selain itu (class, ANY, anchor, lookaround, backref) tidak memberi literal yang pasti ada
+    flush()
+    return ('and', required)
+
+
+def _literal_query(literal):
+    grams = []
+    for word in literal.lower().split():
+        grams.extend(word[i:i + GRAM_SIZE] for i in range(len(word) - GRAM_SIZE + 1))
+    grams = list(dict.fromkeys(grams))
+    if len(grams) > MAX_GRAMS_PER_LITERAL:
+        step = len(grams) / MAX_GRAMS_PER_LITERAL
+        grams = [grams[int(i * step)] for i in range(MAX_GRAMS_PER_LITERAL)]
+    return And([Term(GRAM_FIELD, gram) for gram in grams]) if grams else None
+
+
+def _node_query(node):
+    if isinstance(node, str):
+        return _literal_query(node)
+    kind, children = node
+    queries = [_node_query(child) for child in children]
+    if kind == 'or':
+        # Satu cabang tanpa literal berarti cabang itu bisa match file mana saja
+        return None if not queries or None in queries else Or(queries)
+    queries = [query for query in queries if query is not None]
+    if not queries:
+        return None
+    return queries[0] if len(queries) == 1 else And(queries)
+
+
+def regex_trigram_query(pattern, flags=0):
+    """Query Whoosh yang mencari file kandidat untuk regex dari trigram literal-literalnya.
+
+    Hasilnya superset dari file yang benar-benar match, jadi kandidat tetap harus diverifikasi
+    dengan regex asli. None jika regex tidak punya literal >= 3 karakter yang wajib ada.
+    Regex tidak valid melempar re.error.
+    """
+    if And is None:
+        return None
+    return _node_query(_required_literals(sre_parse.parse(pattern, flags)))
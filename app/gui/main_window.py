@@ -14,6 +14,9 @@ import json
 from .theme_editor import ThemeEditorWindow
 from .analytics_window import AnalyticsWindow
 from ..core.search_engine import SearchEngine
+from ..core.index_watcher import IndexWatcher
+from ..core.semantic_models import DEFAULT_MODEL, LIGHT_MODELS, BACKENDS
+from ..core.ocr import shutdown_ocr_pool
 from ..utils.settings_manager import SettingsManager
 from ..utils.i18n import _, set_language, get_languages, get_current_language
 from .donation_window import DonationWindow
@@ -77,6 +80,30 @@ class FileSearchGUI:
         self.selected_saved_search_var = tk.StringVar()
         self.max_workers_var = tk.IntVar(value=os.cpu_count() or 4)
         self.ai_queue_size_var = tk.IntVar(value=50)
+        self.ai_batch_size_var = tk.IntVar(value=64)
+        self.ai_batch_wait_var = tk.IntVar(value=50)
+        self.semantic_prefilter_var = tk.IntVar(value=1000)
+        self.semantic_model_var = tk.StringVar(value=DEFAULT_MODEL)
+        self.semantic_backend_var = tk.StringVar(value="torch")
+        self.semantic_quantize_var = tk.BooleanVar(value=False)
+        self.ocr_workers_var = tk.IntVar(value=os.cpu_count() or 4)
+        self.ocr_queue_size_var = tk.IntVar(value=(os.cpu_count() or 4) * 2)
+        self.ocr_max_side_var = tk.IntVar(value=3000)
+        self.ocr_binarize_var = tk.BooleanVar(value=False)
+        self.ocr_pdf_dpi_var = tk.IntVar(value=200)
+        self.ocr_pdf_max_pages_var = tk.IntVar(value=100)
+        self.archive_member_max_var = tk.IntVar(value=100)
+        self.backend_var = tk.StringVar(value="thread")
+        self.chunk_size_var = tk.IntVar(value=1024)
+        self.text_cache_var = tk.IntVar(value=512)
+        self.walker_workers_var = tk.IntVar(value=4)
+        self.index_procs_var = tk.IntVar(value=1)
+        self.index_limitmb_var = tk.IntVar(value=128)
+        self.index_multisegment_var = tk.BooleanVar(value=False)
+        self.watch_indexes_var = tk.BooleanVar(value=False)
+        self.hybrid_index_var = tk.BooleanVar(value=True)
+        self.embedding_store_var = tk.BooleanVar(value=True)
+        self.index_watcher = None
         self.save_results_var = tk.BooleanVar(value=True)
         self.size_filter_var = tk.StringVar(value="any")
         self.size_value_var = tk.DoubleVar(value=0)
@@ -163,6 +190,8 @@ class FileSearchGUI:
         perf_frame = ttk.Frame(filters_frame); perf_frame.grid(row=4, column=0, columnspan=2, sticky='w', padx=5, pady=5)
         ttk.Label(perf_frame, text=_("Max Workers:")).pack(side=tk.LEFT)
         ttk.Spinbox(perf_frame, from_=1, to=(os.cpu_count() or 1) * 2, width=5, textvariable=self.max_workers_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(perf_frame, text=_("Walkers:")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(perf_frame, from_=1, to=32, width=4, textvariable=self.walker_workers_var).pack(side=tk.LEFT, padx=5)
         ttk.Label(perf_frame, text=_("AI Queue Size:")).pack(side=tk.LEFT, padx=(10, 0))
         ttk.Spinbox(perf_frame, from_=1, to=1000, width=5, textvariable=self.ai_queue_size_var).pack(side=tk.LEFT, padx=5)
         ttk.Checkbutton(perf_frame, text=_("Auto-save Results"), variable=self.save_results_var).pack(side=tk.LEFT, padx=10)
@@ -171,6 +200,49 @@ class FileSearchGUI:
         self.lang_combo = ttk.Combobox(perf_frame, textvariable=self.lang_var, values=list(get_languages().values()), state='readonly', width=12)
         self.lang_combo.pack(side=tk.LEFT)
         self.lang_combo.bind('<<ComboboxSelected>>', self._on_lang_combo_changed)
+        perf_frame2 = ttk.Frame(filters_frame); perf_frame2.grid(row=5, column=0, columnspan=2, sticky='w', padx=5, pady=(0, 5))
+        ttk.Label(perf_frame2, text=_("Backend:")).pack(side=tk.LEFT)
+        ttk.Combobox(perf_frame2, textvariable=self.backend_var, values=["thread", "process"], width=8, state='readonly').pack(side=tk.LEFT, padx=5)
+        ttk.Label(perf_frame2, text=_("Chunk Size (KB):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(perf_frame2, from_=4, to=65536, increment=256, width=6, textvariable=self.chunk_size_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(perf_frame2, text=_("Text Cache (MB):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(perf_frame2, from_=0, to=102400, increment=128, width=6, textvariable=self.text_cache_var).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(perf_frame2, text=_("Cache Embeddings"), variable=self.embedding_store_var).pack(side=tk.LEFT, padx=10)
+        ttk.Label(perf_frame2, text=_("AI Batch Size:")).pack(side=tk.LEFT)
+        ttk.Spinbox(perf_frame2, from_=1, to=1024, width=5, textvariable=self.ai_batch_size_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(perf_frame2, text=_("AI Batch Wait (ms):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(perf_frame2, from_=0, to=5000, increment=10, width=5, textvariable=self.ai_batch_wait_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(perf_frame2, text=_("Semantic Top-N (0 = all):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(perf_frame2, from_=0, to=1000000, increment=100, width=7, textvariable=self.semantic_prefilter_var).pack(side=tk.LEFT, padx=5)
+        index_perf_frame = ttk.Frame(filters_frame); index_perf_frame.grid(row=6, column=0, columnspan=2, sticky='w', padx=5, pady=(0, 5))
+        ttk.Label(index_perf_frame, text=_("Index Procs:")).pack(side=tk.LEFT)
+        ttk.Spinbox(index_perf_frame, from_=1, to=os.cpu_count() or 1, width=4, textvariable=self.index_procs_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(index_perf_frame, text=_("Index RAM (MB):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(index_perf_frame, from_=16, to=8192, increment=64, width=6, textvariable=self.index_limitmb_var).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(index_perf_frame, text=_("Multi-segment Index"), variable=self.index_multisegment_var).pack(side=tk.LEFT, padx=10)
+        ttk.Checkbutton(index_perf_frame, text=_("Auto-update Indexes"), variable=self.watch_indexes_var, command=self.toggle_index_watcher).pack(side=tk.LEFT)
+        ttk.Checkbutton(index_perf_frame, text=_("Hybrid Index Search"), variable=self.hybrid_index_var).pack(side=tk.LEFT, padx=10)
+        ai_model_frame = ttk.Frame(filters_frame); ai_model_frame.grid(row=7, column=0, columnspan=2, sticky='w', padx=5, pady=(0, 5))
+        ttk.Label(ai_model_frame, text=_("AI Model:")).pack(side=tk.LEFT)
+        ttk.Combobox(ai_model_frame, textvariable=self.semantic_model_var, values=[DEFAULT_MODEL, *LIGHT_MODELS], width=40).pack(side=tk.LEFT, padx=5)
+        ttk.Button(ai_model_frame, text="...", width=3, command=self.browse_semantic_model).pack(side=tk.LEFT)
+        ttk.Label(ai_model_frame, text=_("AI Backend:")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Combobox(ai_model_frame, textvariable=self.semantic_backend_var, values=list(BACKENDS), width=9, state='readonly').pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(ai_model_frame, text=_("Int8 Quantization"), variable=self.semantic_quantize_var).pack(side=tk.LEFT, padx=10)
+        ocr_frame = ttk.Frame(filters_frame); ocr_frame.grid(row=8, column=0, columnspan=2, sticky='w', padx=5, pady=(0, 5))
+        ttk.Label(ocr_frame, text=_("OCR Workers:")).pack(side=tk.LEFT)
+        ttk.Spinbox(ocr_frame, from_=1, to=(os.cpu_count() or 1) * 2, width=4, textvariable=self.ocr_workers_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(ocr_frame, text=_("OCR Queue Size:")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(ocr_frame, from_=1, to=1000, width=5, textvariable=self.ocr_queue_size_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(ocr_frame, text=_("OCR Max Side (px):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(ocr_frame, from_=0, to=20000, increment=250, width=6, textvariable=self.ocr_max_side_var).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(ocr_frame, text=_("Binarize Images"), variable=self.ocr_binarize_var).pack(side=tk.LEFT, padx=10)
+        ttk.Label(ocr_frame, text=_("PDF OCR DPI:")).pack(side=tk.LEFT)
+        ttk.Spinbox(ocr_frame, from_=72, to=600, increment=50, width=4, textvariable=self.ocr_pdf_dpi_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(ocr_frame, text=_("PDF OCR Pages (0 = all):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(ocr_frame, from_=0, to=10000, width=5, textvariable=self.ocr_pdf_max_pages_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(ocr_frame, text=_("Archive Member Limit (MB):")).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(ocr_frame, from_=0, to=102400, increment=50, width=6, textvariable=self.archive_member_max_var).pack(side=tk.LEFT, padx=5)
         control_frame = ttk.Frame(self.left_frame); control_frame.grid(row=2, column=0, pady=10, sticky='w')
         self.search_button = ttk.Button(control_frame, text=_("Start Search"), command=self.start_search); self.search_button.pack(side=tk.LEFT)
         self.build_index_button = ttk.Button(control_frame, text=_("Build Index"), command=self.build_index); self.build_index_button.pack(side=tk.LEFT, padx=5)
@@ -281,6 +353,19 @@ class FileSearchGUI:
             'case': self.case_sensitive_var.get(), 'whole': self.whole_word_var.get(), 
             'regex': self.regex_var.get(), 'ocr': self.ocr_var.get(), 'semantic': self.semantic_var.get(), 
             'ai_queue_size': self.ai_queue_size_var.get(), 'autosave': self.save_results_var.get(),
+            'ai_batch_size': self.ai_batch_size_var.get(), 'ai_batch_wait_ms': self.ai_batch_wait_var.get(),
+            'semantic_prefilter_top': self.semantic_prefilter_var.get(),
+            'semantic_model': self.semantic_model_var.get().strip(), 'semantic_backend': self.semantic_backend_var.get(),
+            'semantic_quantize': self.semantic_quantize_var.get(),
+            'ocr_workers': self.ocr_workers_var.get(), 'ocr_queue_size': self.ocr_queue_size_var.get(),
+            'ocr_max_side': self.ocr_max_side_var.get(), 'ocr_binarize': self.ocr_binarize_var.get(),
+            'ocr_pdf_dpi': self.ocr_pdf_dpi_var.get(), 'ocr_pdf_max_pages': self.ocr_pdf_max_pages_var.get(),
+            'archive_member_max_mb': self.archive_member_max_var.get(),
+            'backend': self.backend_var.get(), 'chunk_size_kb': self.chunk_size_var.get(),
+            'text_cache_mb': self.text_cache_var.get(), 'walker_workers': self.walker_workers_var.get(),
+            'index_procs': self.index_procs_var.get(), 'index_limitmb': self.index_limitmb_var.get(),
+            'index_multisegment': self.index_multisegment_var.get(), 'watch_indexes': self.watch_indexes_var.get(),
+            'hybrid_index': self.hybrid_index_var.get(), 'embedding_store': self.embedding_store_var.get(),
             'ignore_folders': self.ignore_folders_var.get(), 'ignore_files': self.ignore_files_var.get(),
             'saved_searches': self.saved_searches,
             'language': language or get_current_language()
@@ -340,6 +425,17 @@ class FileSearchGUI:
             'regex': self.regex_var.get(), 'ocr': self.ocr_var.get(), 'semantic': self.semantic_var.get(),
             'archive': self.archive_var.get(), 'fuzzy': self.fuzzy_var.get(),
             'max_workers': self.max_workers_var.get(), 'ai_queue_size': self.ai_queue_size_var.get(),
+            'ai_batch_size': self.ai_batch_size_var.get(), 'ai_batch_wait': self.ai_batch_wait_var.get() / 1000,
+            'semantic_prefilter_top': self.semantic_prefilter_var.get(),
+            'semantic_model': self.semantic_model_var.get().strip() or DEFAULT_MODEL, 'semantic_backend': self.semantic_backend_var.get(),
+            'semantic_quantize': self.semantic_quantize_var.get(),
+            'ocr_workers': self.ocr_workers_var.get(), 'ocr_queue_size': self.ocr_queue_size_var.get(),
+            'ocr_max_side': self.ocr_max_side_var.get(), 'ocr_binarize': self.ocr_binarize_var.get(),
+            'ocr_pdf_dpi': self.ocr_pdf_dpi_var.get(), 'ocr_pdf_max_pages': self.ocr_pdf_max_pages_var.get(),
+            'archive_member_max_mb': self.archive_member_max_var.get(),
+            'backend': self.backend_var.get(), 'chunk_size': max(4, self.chunk_size_var.get()) * 1024,
+            'text_cache_mb': self.text_cache_var.get(), 'walker_workers': self.walker_workers_var.get(),
+            'hybrid_index': self.hybrid_index_var.get(), 'embedding_store': self.embedding_store_var.get(),
             'ignore_folders': {name.strip() for name in self.ignore_folders_var.get().split(',') if name.strip()},
             'ignore_files': [pat.strip() for pat in self.ignore_files_var.get().split(',') if pat.strip()],
             'size_filters': size_filters, 'date_filters': date_filters
@@ -414,8 +510,31 @@ class FileSearchGUI:
              else:
                 return
         self.save_settings()
+        self.stop_index_watcher()
+        shutdown_ocr_pool()
         self.root.destroy()
         
+    def start_index_watcher(self):
+        # Watcher membaca daftar index saat start, jadi restart setelah index baru dibangun
+        self.stop_index_watcher()
+        self.index_watcher = IndexWatcher(
+            {'text_cache_mb': self.text_cache_var.get(), 'walker_workers': self.walker_workers_var.get(),
+             'index_limitmb': self.index_limitmb_var.get()},
+            status_callback=lambda msg: self.root.after(0, lambda: self.status_var.set(msg) if not self.search_running else None)
+        )
+        self.index_watcher.start()
+
+    def stop_index_watcher(self):
+        if self.index_watcher:
+            self.index_watcher.stop()
+            self.index_watcher = None
+
+    def toggle_index_watcher(self):
+        if self.watch_indexes_var.get():
+            self.start_index_watcher()
+        else:
+            self.stop_index_watcher()
+
     def add_result_to_tree(self, file_info):
         size_str = f"{file_info['size']/1024:,.1f} KB" if file_info['size'] > 1024 else f"{file_info['size']} B"
         mod_time_str = time.strftime("%Y-%m-%d %H:%M", time.localtime(file_info['modified']))
@@ -493,6 +612,29 @@ class FileSearchGUI:
         self.ocr_var.set(settings.get('ocr', False))
         self.semantic_var.set(settings.get('semantic', False))
         self.ai_queue_size_var.set(settings.get('ai_queue_size', 50))
+        self.ai_batch_size_var.set(settings.get('ai_batch_size', 64))
+        self.ai_batch_wait_var.set(settings.get('ai_batch_wait_ms', 50))
+        self.semantic_prefilter_var.set(settings.get('semantic_prefilter_top', 1000))
+        self.semantic_model_var.set(settings.get('semantic_model', DEFAULT_MODEL))
+        self.semantic_backend_var.set(settings.get('semantic_backend', 'torch'))
+        self.semantic_quantize_var.set(settings.get('semantic_quantize', False))
+        self.ocr_workers_var.set(settings.get('ocr_workers', os.cpu_count() or 4))
+        self.ocr_queue_size_var.set(settings.get('ocr_queue_size', (os.cpu_count() or 4) * 2))
+        self.ocr_max_side_var.set(settings.get('ocr_max_side', 3000))
+        self.ocr_binarize_var.set(settings.get('ocr_binarize', False))
+        self.ocr_pdf_dpi_var.set(settings.get('ocr_pdf_dpi', 200))
+        self.ocr_pdf_max_pages_var.set(settings.get('ocr_pdf_max_pages', 100))
+        self.archive_member_max_var.set(settings.get('archive_member_max_mb', 100))
+        self.backend_var.set(settings.get('backend', 'thread'))
+        self.chunk_size_var.set(settings.get('chunk_size_kb', 1024))
+        self.text_cache_var.set(settings.get('text_cache_mb', 512))
+        self.walker_workers_var.set(settings.get('walker_workers', 4))
+        self.index_procs_var.set(settings.get('index_procs', 1))
+        self.index_limitmb_var.set(settings.get('index_limitmb', 128))
+        self.index_multisegment_var.set(settings.get('index_multisegment', False))
+        self.watch_indexes_var.set(settings.get('watch_indexes', False))
+        self.hybrid_index_var.set(settings.get('hybrid_index', True))
+        self.embedding_store_var.set(settings.get('embedding_store', True))
         self.save_results_var.set(settings.get('autosave', True))
         self.ignore_folders_var.set(settings.get('ignore_folders', '.git, .svn, .vscode, .idea, __pycache__, node_modules, venv, env, build, dist'))
         self.ignore_files_var.set(settings.get('ignore_files', '*.log, *.tmp, *.bak'))
@@ -506,6 +648,9 @@ class FileSearchGUI:
             self.apply_theme("Custom", custom_theme_dict=settings['custom_theme'])
         else:
             self.apply_theme(theme_to_load)
+        
+        if self.watch_indexes_var.get():
+            self.start_index_watcher()
 
     def save_settings(self):
         self.settings_manager.save(self.get_settings_dict())
@@ -515,6 +660,11 @@ class FileSearchGUI:
         if folder:
             self.search_path_var.set(folder)
 
+    def browse_semantic_model(self):
+        folder = filedialog.askdirectory(title="Select a Local Sentence-Transformers Model Folder", parent=self.root)
+        if folder:
+            self.semantic_model_var.set(folder)
+
     def _get_size_filters(self):
         if self.size_filter_var.get() == 'any': return None
         multipliers = {"KB": 1024, "MB": 1024**2, "GB": 1024**3}
@@ -611,7 +761,7 @@ class FileSearchGUI:
         
         self.root.update_idletasks() 
         
-        content = SearchEngine({}, None)._get_file_content(file_path)
+        content = SearchEngine({'text_cache_mb': self.text_cache_var.get()}, None)._get_file_content(file_path)
         
         self.preview_pane.config(state="normal")
         self.preview_pane.delete(1.0, tk.END)
@@ -803,25 +953,36 @@ class FileSearchGUI:
             
         def _index_thread():
             try:
-                engine = SearchEngine({}, None)
-                engine.build_index_for_path(
+                engine = SearchEngine({
+                    'text_cache_mb': self.text_cache_var.get(), 'walker_workers': self.walker_workers_var.get(),
+                    'max_workers': self.max_workers_var.get(), 'backend': self.backend_var.get(),
+                    'index_procs': self.index_procs_var.get(), 'index_limitmb': self.index_limitmb_var.get(),
+                    'index_multisegment': self.index_multisegment_var.get()
+                }, None)
+                stats = engine.build_index_for_path(
                     path, 
                     ignore_folders={name.strip() for name in self.ignore_folders_var.get().split(',') if name.strip()},
                     ignore_files=[pat.strip() for pat in self.ignore_files_var.get().split(',') if pat.strip()],
                     progress_callback=lambda msg: self.root.after(0, lambda: self.status_var.set(msg))
                 )
                 index_loc = engine._get_index_dir_for_path(path)
-                msg = f"Index created successfully for:\n{path}\n\nIndex Database Saved to:\n{index_loc}"
+                msg = (f"Index updated successfully for:\n{path}\n\n"
+                       f"Added: {stats['added']}, Updated: {stats['updated']}, Deleted: {stats['deleted']}, Unchanged: {stats['skipped']}\n\n"
+                       f"Index Database Saved to:\n{index_loc}")
                 self.root.after(0, lambda: messagebox.showinfo("Index Built", msg))
                 self.root.after(0, lambda: self.status_var.set("Ready"))
             except Exception as e:
                 self.root.after(0, lambda e=e: messagebox.showerror("Index Error", f"Failed to build index: {e}"))
                 self.root.after(0, lambda: self.status_var.set("Ready"))
             finally:
+                if self.watch_indexes_var.get():
+                    self.root.after(0, self.start_index_watcher)
                 self.root.after(0, lambda: self.build_index_button.config(state=tk.NORMAL))
                 self.root.after(0, self.progress_bar.stop)
                 self.root.after(0, self.progress_bar.pack_forget)
                 
+        # Rescan watcher memegang lock writer index yang sama; watcher dijalankan lagi setelah build selesai
+        self.stop_index_watcher()
         self.build_index_button.config(state=tk.DISABLED)
         self.status_var.set("Building index... This may take a while.")
         self.progress_bar.pack(side=tk.RIGHT, padx=5, pady=2)
@@ -31,6 +31,29 @@ class I18n:
                 'Ignore Files:': 'Abaikan File:',
                 'Max Workers:': 'Pekerja Maks:',
                 'AI Queue Size:': 'Antrean AI:',
+                'Backend:': 'Mode Eksekusi:',
+                'Chunk Size (KB):': 'Ukuran Chunk (KB):',
+                'Text Cache (MB):': 'Cache Teks (MB):',
+                'Walkers:': 'Penjelajah Folder:',
+                'Index Procs:': 'Proses Indeks:',
+                'Index RAM (MB):': 'RAM Indeks (MB):',
+                'Multi-segment Index': 'Indeks Multi-segmen',
+                'Auto-update Indexes': 'Perbarui Indeks Otomatis',
+                'Hybrid Index Search': 'Pencarian Indeks Hybrid',
+                'Cache Embeddings': 'Simpan Embedding',
+                'AI Batch Size:': 'Ukuran Batch AI:',
+                'AI Batch Wait (ms):': 'Tunggu Batch AI (ms):',
+                'Semantic Top-N (0 = all):': 'Top-N Semantik (0 = semua):',
+                'AI Model:': 'Model AI:',
+                'AI Backend:': 'Backend AI:',
+                'Int8 Quantization': 'Kuantisasi Int8',
+                'OCR Workers:': 'Worker OCR:',
+                'OCR Queue Size:': 'Ukuran Antrean OCR:',
+                'OCR Max Side (px):': 'Sisi Maks OCR (px):',
+                'Binarize Images': 'Binerisasi Gambar',
+                'PDF OCR DPI:': 'DPI OCR PDF:',
+                'PDF OCR Pages (0 = all):': 'Halaman OCR PDF (0 = semua):',
+                'Archive Member Limit (MB):': 'Batas Member Arsip (MB):',
                 'Auto-save Results': 'Simpan Otomatis',
                 'Start Search': 'Mulai Pencarian',
                 'Build Index': 'Bangun Indeks',
@@ -25,6 +25,29 @@ class SettingsManager:
             'ocr': False,
             'semantic': False,
             'ai_queue_size': 50,
+            'ai_batch_size': 64,
+            'ai_batch_wait_ms': 50,
+            'semantic_prefilter_top': 1000,
+            'semantic_model': 'paraphrase-multilingual-mpnet-base-v2',
+            'semantic_backend': 'torch',
+            'semantic_quantize': False,
+            'ocr_workers': os.cpu_count() or 4,
+            'ocr_queue_size': (os.cpu_count() or 4) * 2,
+            'ocr_max_side': 3000,
+            'ocr_binarize': False,
+            'ocr_pdf_dpi': 200,
+            'ocr_pdf_max_pages': 100,
+            'archive_member_max_mb': 100,
+            'backend': 'thread',
+            'chunk_size_kb': 1024,
+            'text_cache_mb': 512,
+            'walker_workers': 4,
+            'index_procs': 1,
+            'index_limitmb': 128,
+            'index_multisegment': False,
+            'watch_indexes': False,
+            'hybrid_index': True,
+            'embedding_store': True,
             'autosave': True,
             'ignore_folders': '.git, .svn, .vscode, .idea, __pycache__, node_modules, venv, env, build, dist, temp, tmp, $RECYCLE.BIN, System Volume Information',
             'ignore_files': '*.log, *.tmp, *.bak, .DS_Store, thumbs.db',
@@ -40,6 +63,29 @@ class SettingsManager:
             'ocr': False,
             'semantic': False,
             'ai_queue_size': 50,
+            'ai_batch_size': 64,
+            'ai_batch_wait_ms': 50,
+            'semantic_prefilter_top': 1000,
+            'semantic_model': 'paraphrase-multilingual-mpnet-base-v2',
+            'semantic_backend': 'torch',
+            'semantic_quantize': False,
+            'ocr_workers': os.cpu_count() or 4,
+            'ocr_queue_size': (os.cpu_count() or 4) * 2,
+            'ocr_max_side': 3000,
+            'ocr_binarize': False,
+            'ocr_pdf_dpi': 200,
+            'ocr_pdf_max_pages': 100,
+            'archive_member_max_mb': 100,
+            'backend': 'thread',
+            'chunk_size_kb': 1024,
+            'text_cache_mb': 512,
+            'walker_workers': 4,
+            'index_procs': 1,
+            'index_limitmb': 128,
+            'index_multisegment': False,
+            'watch_indexes': False,
+            'hybrid_index': True,
+            'embedding_store': True,
             'autosave': True,
             'ignore_folders': '.git, .svn, .vscode, .idea, __pycache__, node_modules, venv, env, build, dist, temp, tmp, $RECYCLE.BIN, System Volume Information',
             'ignore_files': '*.log, *.tmp, *.bak, .DS_Store, thumbs.db',
@@ -2,20 +2,24 @@
 import os
 import sys
 import ctypes
-import tkinter as tk
-from tkinter import ttk, messagebox
-from app.gui.main_window import FileSearchGUI
-from app.utils.settings_manager import SettingsManager
-from app.utils.i18n import set_language, _
-
-# ### PERUBAHAN DI SINI: Import Pillow ###
-try:
-    from PIL import Image, ImageTk
-except ImportError:
-    ImageTk = None
+import multiprocessing
 
 def main():
     """Fungsi utama untuk menjalankan aplikasi dengan splash screen."""
+    # GUI di-import di sini, bukan di level modul: proses worker (spawn di Windows / build frozen)
+    # menjalankan ulang level modul main.py dan tidak perlu memuat tkinter, GUI maupun engine
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    from app.gui.main_window import FileSearchGUI
+    from app.utils.settings_manager import SettingsManager
+    from app.utils.i18n import set_language, _
+
+    # ### PERUBAHAN DI SINI: Import Pillow ###
+    try:
+        from PIL import Image, ImageTk
+    except ImportError:
+        ImageTk = None
+
     # Inisialisasi Settings & Bahasa di awal agar notifikasi menggunakan bahasa yang benar
     settings = SettingsManager().load()
     set_language(settings.get('language', 'en'))
@@ -91,4 +95,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Wajib untuk backend process-pool pada build PyInstaller/Nuitka di Windows
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file